@@ -0,0 +1,50 @@
+"""
+Compara los generadores de NumbersModel: numeros por segundo al generar un bloque y
+proporcion de bloques que pasan la bateria de pruebas del curso (test_numbers).
+
+Uso: python benchmarks/generators_benchmark.py [--size 65536] [--seeds 20] [--repeats 5]
+"""
+import argparse
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+# el paquete scripts abre la ventana del juego al importarse, el benchmark no la necesita
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.numbs_aux import test_numbers
+from scripts.number_generators import BACKENDS, generate_block
+
+def throughput(backend, size, repeats):
+    conf = backend.make_conf(123456, 20)
+    generate_block(conf, size) # calentamiento
+    start = time.perf_counter()
+    for _ in range(repeats):
+        generate_block(conf, size)
+    return size * repeats / (time.perf_counter() - start)
+
+def pass_rate(backend, size, seeds):
+    passed = 0
+    start = time.perf_counter()
+    for seed in range(seeds):
+        passed += test_numbers(generate_block(backend.make_conf(1000003 * seed + 17, 20), size))
+    return passed / seeds, (time.perf_counter() - start) / seeds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=2**16, help="numeros por bloque")
+    parser.add_argument("--seeds", type=int, default=20, help="semillas probadas por generador")
+    parser.add_argument("--repeats", type=int, default=5, help="bloques generados para medir velocidad")
+    args = parser.parse_args()
+    print(f"{'generador':<10} {'numeros/s':>14} {'pasan':>8} {'s/prueba':>10}")
+    for name, backend in BACKENDS.items():
+        speed = throughput(backend, args.size, args.repeats)
+        rate, test_time = pass_rate(backend, args.size, args.seeds)
+        print(f"{name:<10} {speed:>14,.0f} {rate:>8.0%} {test_time:>10.3f}")
+
+if __name__ == "__main__":
+    main()
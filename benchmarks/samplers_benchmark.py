@@ -0,0 +1,51 @@
+"""
+Compara las formas de muestrear una distribucion de montecarlo segun su tamaño: montecarlo (recorre
+la lista), CategoricalSampler (busqueda binaria) y AliasSampler (metodo de alias), en microsegundos
+por muestra, con la distribucion ya armada.
+
+Uso: python benchmarks/samplers_benchmark.py [--sizes 3 10 100 1000 10000] [--draws 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from unittest.mock import MagicMock
+
+# el paquete scripts abre la ventana del juego al importarse, el benchmark no la necesita
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.model_scripts.montecarlo import AliasSampler, CategoricalSampler, montecarlo
+
+def distribution(size, rng):
+    weights = [rng.random() for _ in range(size)]
+    total = sum(weights)
+    return [(f"value{i}", weight / total) for i, weight in enumerate(weights)]
+
+def per_draw(sample, values):
+    start = time.perf_counter()
+    for value in values:
+        sample(value)
+    return (time.perf_counter() - start) / len(values) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 10, 100, 1000, 10000], help="valores por distribucion")
+    parser.add_argument("--draws", type=int, default=20000, help="muestras por medicion")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    values = [rng.random() for _ in range(args.draws)]
+    print(f"{'valores':>8} {'montecarlo':>11} {'bisect':>9} {'alias':>9}  (us por muestra)")
+    for size in args.sizes:
+        options = distribution(size, rng)
+        categorical, alias = CategoricalSampler(options), AliasSampler(options)
+        linear = per_draw(lambda value: montecarlo(options, value), values)
+        print(f"{size:>8} {linear:>11.3f} {per_draw(categorical.sample, values):>9.3f} "
+              f"{per_draw(alias.sample, values):>9.3f}")
+
+if __name__ == "__main__":
+    main()
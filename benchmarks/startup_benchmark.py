@@ -0,0 +1,53 @@
+"""
+Mide el arranque del modelo del juego en un interprete nuevo: importar scripts.model_scripts y crear
+el GameModel (lo que ocurre antes de mostrar el menu) y, aparte, crear el generador de numeros al
+empezar la primera partida. Informa tambien que librerias pesadas quedaron cargadas en cada etapa.
+
+Uso: python benchmarks/startup_benchmark.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEAVY_MODULES = ["numpy", "scipy", "pandas"]
+
+# se ejecuta en un proceso aparte para que ninguna importacion quede en cache entre corridas
+STARTUP_CODE = f"""
+import json, sys, time
+from unittest.mock import MagicMock
+# el paquete scripts abre la ventana del juego al importarse, el benchmark no la necesita
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+start = time.perf_counter()
+from scripts.model_scripts import GameModel
+game_model = GameModel(1080, 720)
+menu = time.perf_counter() - start
+menu_modules = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+start = time.perf_counter()
+game_model.numbers_model
+first_game = time.perf_counter() - start
+game_modules = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(json.dumps([menu, first_game, menu_modules, game_modules]))
+"""
+
+def measure():
+    output = subprocess.run([sys.executable, "-c", STARTUP_CODE], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="interpretes nuevos medidos")
+    args = parser.parse_args()
+    results = [measure() for _ in range(args.runs)]
+    menu = statistics.median(result[0] for result in results)
+    first_game = statistics.median(result[1] for result in results)
+    print(f"hasta el menu:        {menu * 1000:8.1f} ms  cargadas: {', '.join(results[0][2]) or '-'}")
+    print(f"generador al jugar:   {first_game * 1000:8.1f} ms  cargadas: {', '.join(results[0][3]) or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ sys.modules['tkinter'] = MagicMock()
 sys.modules['scripts.game_configs'] = MagicMock()
 
 from scripts.model_scripts.game_model import GameModel
+from scripts.model_scripts.numbers_model import NumbersModel
+from scripts.model_scripts.numbers_store import NumbersStore
+from scripts.model_scripts.numbers_verdicts import VerdictCache
 from scripts.game_entities.data_models import PrefabData, AttackData
 
 EASY_DIFFICULTY = "Fácil"
@@ -16,9 +19,15 @@ HARD_DIFFICULTY = "Difícil"
 class TestGameModel:
     
     @pytest.fixture
-    def game_model(self)-> GameModel:
-        """Fixture que crea una instancia de GameModel para las pruebas"""
-        return GameModel(1080, 720)
+    def game_model(self, tmp_path)-> GameModel:
+        """Fixture que crea una instancia de GameModel para las pruebas, con el almacen en tmp_path"""
+        def numbers_factory():
+            return NumbersModel(store=NumbersStore(folder=str(tmp_path / "numbers_store")),
+                                verdicts=VerdictCache(path=str(tmp_path / "numbers_verdicts.json")))
+        game_model = GameModel(1080, 720, numbers_factory=numbers_factory)
+        yield game_model
+        # el hilo de recarga no debe seguir generando bloques despues de la prueba
+        game_model.stop_numbers()
     
     @pytest.fixture
     def mock_callables(self) -> dict[str, Mock]:
@@ -46,6 +55,17 @@ class TestGameModel:
         assert game_model.environment is not None
         assert game_model.numbers_model is not None
 
+    def test_numbers_model_is_created_on_first_use(self, game_model: GameModel):
+        """Prueba que el generador no se crea hasta que se usa"""
+        assert game_model._GameModel__numbers_model is None
+        assert game_model.streams == {}
+        game_model.stop_numbers()
+        numbers_model = game_model.numbers_model
+        assert game_model.numbers_model is numbers_model
+        assert game_model.streams["damage"] is numbers_model.substream("damage")
+        game_model.stop_numbers()
+        assert numbers_model.terminate
+
     def test_reset_game_normal_difficulty(self, game_model: GameModel):
         """Prueba reset_game con dificultad normal"""
         game_model.reset_game(NORMAL_DIFFICULTY)
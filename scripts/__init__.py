@@ -1,5 +1,12 @@
-from scripts.game_controller import GameScene
-from scripts.model import Model
-from scripts.presenter import Presenter
+import importlib
 
-__all__ = ["GameScene", "Model", "Presenter"]
\ No newline at end of file
+__all__ = ["GameScene", "Model", "Presenter"]
+
+# modulo de cada nombre exportado; game_controller abre la ventana del juego al importarse, asi que
+# se carga recien cuando se pide y los procesos que solo generan o prueban numeros no la abren
+EXPORTS = {"GameScene": "scripts.game_controller", "Model": "scripts.model", "Presenter": "scripts.presenter"}
+
+def __getattr__(name):
+    if name in EXPORTS:
+        return getattr(importlib.import_module(EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -40,7 +40,7 @@ class Model(IModel):
 
     def quit_game(self):
         self.game_model.terminate = True
-        self.game_model.numbers_model.terminate = True
+        self.game_model.stop_numbers()
 
     def get_random_between(self, min, max):
-        return self.game_model.get_ni_number(min, max)
\ No newline at end of file
+        return self.game_model.get_ni_number(min, max, stream="view")
\ No newline at end of file
@@ -1,4 +1,12 @@
-from scripts.model_scripts.game_model import GameModel
-from scripts.model_scripts.numbers_model import NumbersModel
+import importlib
 
-__all__ = ["GameModel", "NumbersModel"]
\ No newline at end of file
+__all__ = ["GameModel", "NumbersModel"]
+
+# GameModel importa las entidades del juego (pygame) y NumbersModel importa numpy, se cargan recien
+# cuando se piden; los procesos de busqueda importan este paquete y no deben abrir la ventana
+EXPORTS = {"GameModel": "scripts.model_scripts.game_model", "NumbersModel": "scripts.model_scripts.numbers_model"}
+
+def __getattr__(name):
+    if name in EXPORTS:
+        return getattr(importlib.import_module(EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,19 +1,64 @@
 from scripts.game_entities.data_models import PrefabData, EnvironmentData, AttackData
-from scripts.model_scripts.numbers_model import NumbersModel
 from scripts.model_scripts.markov import MarkovNode, MarkovChain
 from scripts.model_scripts.waiting_lines import WaitingLinesArrival
 from scripts.model_scripts.random_walk import random_choice
-from scripts.model_scripts.montecarlo import montecarlo
-from typing import Callable
+from scripts.model_scripts.montecarlo import CategoricalSampler
+from typing import TYPE_CHECKING, Callable
 import math
+import threading
 import time
 
+if TYPE_CHECKING:
+    from scripts.model_scripts.numbers_model import NumbersModel
+
+# consumidores de numeros pseudoaleatorios, cada uno con su propia subsecuencia
+STREAMS = ["default", "view", "enemies", "positions", "waves", "arrivals", "damage", "walks", "rewards"]
+
+# distribuciones de montecarlo, se arman una vez para todas las partidas
+ENEMY_SAMPLER = CategoricalSampler([
+    (("type1", 150, 7), 0.45),
+    (("type2", 125, 9), 0.35),
+    (("type3", 100, 4), 0.20)
+])
+# lado del mapa por el que entra un enemigo
+POSITION_SAMPLER = CategoricalSampler([
+    ("left", 0.25),
+    ("right", 0.25),
+    ("bottom", 0.25),
+    ("top", 0.25)
+])
+DAMAGE_SAMPLER = CategoricalSampler([
+    (2, 0.5),   # 50% probabilidad de hacer 2 de daño
+    (1, 0.35),  # 35% probabilidad de hacer 1 de daño
+    (0, 0.15)   # 15% probabilidad de no hacer daño
+])
+WEAPON_SAMPLER = CategoricalSampler([
+    ("submachine", 0.5),
+    ("rifle", 0.3),
+    ("shotgun", 0.15),
+    ("raygun", 0.05)
+])
+
+def default_numbers_model():
+    from scripts.model_scripts.numbers_model import NumbersModel
+    from scripts.model_scripts.numbers_store import NumbersStore
+    from scripts.model_scripts.numbers_verdicts import VerdictCache
+    return NumbersModel(store=NumbersStore(), verdicts=VerdictCache())
+
 NORMAL_DIFFICULTY = "Normal"
 HARD_DIFFICULTY = "Difícil"
 
 class GameModel:
-    def __init__(self, width: int, height: int):
-        self.numbers_model = NumbersModel()
+    def __init__(self, width: int, height: int, numbers_factory: Callable[[], "NumbersModel"] | None = None):
+        """
+        :param numbers_factory: Funcion que crea el generador de numeros; por defecto uno que guarda
+            bloques y resultados en resources para la siguiente partida
+        """
+        # el generador trae numpy y se crea al primer uso, asi el menu aparece sin esperarlo
+        self.__numbers_model = None
+        self.__numbers_factory = numbers_factory or default_numbers_model
+        self.__numbers_lock = threading.Lock()
+        self.streams = {}
         self.environment = EnvironmentData(width, height)
         self.in_pause = False
         self.terminate = False
@@ -25,6 +70,21 @@ class GameModel:
         self.__init_markov_chain()
         self.waiting_lines_arrival = WaitingLinesArrival(5) # valor default 5 de lamda en llegadas/minuto
 
+    @property
+    def numbers_model(self):
+        if self.__numbers_model is None:
+            with self.__numbers_lock:
+                if self.__numbers_model is None:
+                    numbers_model = self.__numbers_factory()
+                    self.streams = {name: numbers_model.substream(name) for name in STREAMS}
+                    self.__numbers_model = numbers_model
+        return self.__numbers_model
+
+    def stop_numbers(self):
+        # si el generador nunca se uso no hay hilo de recarga que detener
+        if self.__numbers_model is not None:
+            self.__numbers_model.terminate = True
+
     def reset_game(self, difficulty: str):
         self.terminate = False
         self.environment.reset_environment()
@@ -61,7 +121,7 @@ class GameModel:
         for i in range(1, self.waves + 1):
             time.sleep(self.waves_waiting_time)
             enemies_amount = self.default_enemies
-            enemies_amount += int(self.get_ni_number(i, i*3))
+            enemies_amount += int(self.get_ni_number(i, i*3, stream="waves"))
             self.__waiting_lines_enemies_generation(enemy_generation_function, enemies_amount)
             if self.terminate:
                 return
@@ -83,7 +143,7 @@ class GameModel:
             en, type = self.generate_enemy()
             enemy_generation_function(en, type)
             enemy_counter += 1
-            ri = self.__get_pseudo_random_number()
+            ri = self.__get_pseudo_random_number("arrivals")
             segs = self.waiting_lines_arrival.next_arrival_interval_time(ri) * 60 # minutos a segundos
             time.sleep(segs)
 
@@ -98,28 +158,21 @@ class GameModel:
 
 
     def __get_montecarlo_enemy_position(self):
-        num = self.__get_pseudo_random_number()
+        num = self.__get_pseudo_random_number("positions")
         height = self.environment.height
         width = self.environment.width
-
-        position_distribution = [
-            (lambda: (0, int(self.get_ni_number(0, height))), 0.25),
-            (lambda: (width, int(self.get_ni_number(0, height))), 0.25),
-            (lambda: (int(self.get_ni_number(0, width)), height), 0.25),
-            (lambda: (int(self.get_ni_number(0, width)), 0), 0.25)
-        ]
-
-        selected_position = montecarlo(position_distribution, num)
-        return selected_position()
+        side = POSITION_SAMPLER.sample(num)
+        if side == "left":
+            return 0, int(self.get_ni_number(0, height, stream="positions"))
+        if side == "right":
+            return width, int(self.get_ni_number(0, height, stream="positions"))
+        if side == "bottom":
+            return int(self.get_ni_number(0, width, stream="positions")), height
+        return int(self.get_ni_number(0, width, stream="positions")), 0
 
     def __get_montecarlo_enemy(self):
-        num = self.__get_pseudo_random_number()
-        enemy_distribution = [
-            (("type1", 150, 7), 0.45),
-            (("type2", 125, 9), 0.35),
-            (("type3", 100, 4), 0.20)
-        ]
-        return montecarlo(enemy_distribution, num)
+        num = self.__get_pseudo_random_number("enemies")
+        return ENEMY_SAMPLER.sample(num)
 
     def generate_final_enemy(self):
         life = 2000
@@ -208,7 +261,7 @@ class GameModel:
     directions = ["left", "up", "right", "down"]
     
     def __two_dimension_random_walk(self):
-        return random_choice(self.directions, rand_num=self.__get_pseudo_random_number())
+        return random_choice(self.directions, rand_num=self.__get_pseudo_random_number("walks"))
 
     def __calculate_melee_attack(self, enemy: PrefabData, observation_space: tuple[int, int, int, int, int, int]):
         ob_x, ob_y, ob_max_x, ob_min_x, ob_max_y, ob_min_y = observation_space
@@ -281,11 +334,14 @@ class GameModel:
                 elif shoot.type == "melee":
                     shoot.alive = False
 
-    def __get_pseudo_random_number(self):
-        return self.numbers_model.get_next_pseudo_random_number()
+    def __get_pseudo_random_number(self, stream: str = "default"):
+        # cada consumidor lee de su propia subsecuencia para no compartir el cursor con los demas
+        if not self.streams:
+            self.numbers_model # crea el generador y las subsecuencias
+        return self.streams[stream].get_next_pseudo_random_number()
     
-    def get_ni_number(self, a, b):
-        ri = self.__get_pseudo_random_number()
+    def get_ni_number(self, a, b, stream: str = "default"):
+        ri = self.__get_pseudo_random_number(stream)
         return a + (b - a) * ri
     
     def __verify_shoot_damage(self, shoot: AttackData, to: PrefabData, is_enemy: bool)-> bool:
@@ -323,23 +379,12 @@ class GameModel:
         return False, 0
     
     def __get_montecarlo_damage(self):
-        num = self.__get_pseudo_random_number()
-        damage_distribution = [
-            (2, 0.5),   # 50% probabilidad de hacer 2 de daño
-            (1, 0.35),  # 35% probabilidad de hacer 1 de daño
-            (0, 0.15)   # 15% probabilidad de no hacer daño
-        ]
-        return montecarlo(damage_distribution, num)
+        num = self.__get_pseudo_random_number("damage")
+        return DAMAGE_SAMPLER.sample(num)
         
     def __get_montecarlo_weapon(self):
-        num = self.__get_pseudo_random_number()
-        weapon_distribution = [
-            ("submachine", 0.5),
-            ("rifle", 0.3),
-            ("shotgun", 0.15),
-            ("raygun", 0.05)
-        ]
-        return montecarlo(weapon_distribution, num)
+        num = self.__get_pseudo_random_number("rewards")
+        return WEAPON_SAMPLER.sample(num)
         
     def __init_markov_chain(self):
     # Crea la matriz de nodos (cada fila representa el estado actual)
@@ -365,7 +410,7 @@ class GameModel:
         )
 
     def __get_reward(self):
-        num = self.__get_pseudo_random_number()
+        num = self.__get_pseudo_random_number("rewards")
         self.chain.set_state(num)
         return self.chain.current_state.value
         
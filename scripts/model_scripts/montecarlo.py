@@ -1,6 +1,8 @@
 # scripts/model_scripts/montecarlo.py
 
-from typing import List, Tuple
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, List, Tuple
 
 def montecarlo(options: List[Tuple[str, float]], random_value: float) -> str:
     """
@@ -17,3 +19,75 @@ def montecarlo(options: List[Tuple[str, float]], random_value: float) -> str:
             return value
     # Por si hay un pequeño error de redondeo
     return options[-1][0]
+
+class CategoricalSampler:
+    """
+    Distribucion de montecarlo que se arma una sola vez: guarda los valores y las probabilidades
+    acumuladas, y cada muestra es una busqueda binaria en lugar de recorrer y sumar la lista.
+    Devuelve lo mismo que montecarlo para la misma lista y el mismo numero.
+    """
+    def __init__(self, options: List[Tuple[Any, float]]):
+        """
+        :param options: Lista de tuplas (valor, probabilidad)
+        """
+        if not options:
+            raise ValueError("Options cannot be empty.")
+        self.values = [value for value, _ in options]
+        # se suman en el mismo orden que en montecarlo, asi los limites coinciden exactamente
+        self.cumulative = list(accumulate(probability for _, probability in options))
+
+    def sample(self, random_value: float):
+        """
+        :param random_value: Número pseudoaleatorio entre 0 y 1
+        :return: Primer valor cuya probabilidad acumulada supera a random_value, el ultimo si ninguna
+        """
+        index = bisect_right(self.cumulative, random_value)
+        return self.values[index] if index < len(self.values) else self.values[-1]
+
+class AliasSampler:
+    """
+    Distribucion de montecarlo con el metodo de alias de Walker, construido con el algoritmo de Vose.
+    Cada valor ocupa una columna de ancho 1/n que comparte con a lo sumo otro valor (su alias), asi
+    una muestra cuesta lo mismo sea cual sea el tamaño de la tabla: elegir columna y elegir valor.
+
+    Sigue la misma distribucion que montecarlo para la misma lista, incluido que lo que falta para
+    sumar 1 va al ultimo valor, pero no devuelve el mismo valor para cada numero.
+    """
+    def __init__(self, options: List[Tuple[Any, float]]):
+        """
+        :param options: Lista de tuplas (valor, probabilidad)
+        """
+        if not options:
+            raise ValueError("Options cannot be empty.")
+        self.values = [value for value, _ in options]
+        self.size = n = len(options)
+        # probabilidad efectiva de cada valor en montecarlo: las acumuladas se cortan en 1
+        cumulative = [min(max(total, 0.0), 1.0) for total in accumulate(probability for _, probability in options)]
+        probabilities = [high - low for low, high in zip([0.0] + cumulative[:-1], cumulative[:-1] + [1.0])]
+        scaled = [probability * n for probability in probabilities]
+        self.threshold = [1.0] * n # probabilidad de quedarse con el valor de la columna
+        alias = list(range(n))
+        small = [i for i, weight in enumerate(scaled) if weight < 1.0]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.threshold[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # lo que queda tiene peso 1 salvo por redondeo, se queda con su propio valor
+        self.alias_values = [self.values[i] for i in alias]
+
+    def sample(self, random_value: float, second_value: float | None = None):
+        """
+        :param random_value: Número pseudoaleatorio entre 0 y 1, elige la columna
+        :param second_value: Número pseudoaleatorio entre 0 y 1 que elige entre el valor y su alias;
+            si no se da se usa la parte fraccionaria de random_value * n
+        :return: Valor seleccionado
+        """
+        position = random_value * self.size
+        column = int(position)
+        if column == self.size: # random_value == 1
+            column -= 1
+        coin = position - column if second_value is None else second_value
+        return self.values[column] if coin < self.threshold[column] else self.alias_values[column]
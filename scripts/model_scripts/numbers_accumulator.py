@@ -0,0 +1,114 @@
+from scripts.numbs_aux import ACCEPTABLE_ERROR, POKER_PROBABILITIES, TEST_NAMES, battery_tests, get_quantile, \
+    poker_hands, sturges_intervals
+from scripts.model_scripts.numbers_report import ValidationReport, run_tests
+import numpy as np
+
+ACCUMULATOR_CHUNK = 8192 # numeros por tramo; el primero ya alcanza para descartar los bloques muy malos
+
+class NumbersAccumulator:
+    """
+    Acumula tramo a tramo lo que necesitan las pruebas de test_numbers: media y varianza (Welford,
+    combinando tramos con la formula de Chan), frecuencias por intervalo y manos de poker.
+
+    Al terminar el bloque las pruebas solo comparan los acumulados con sus valores criticos. Antes
+    de terminar, una cota inferior de los estadisticos de chi cuadrado y de poker permite descartar
+    un bloque que ya no puede pasar, sin procesar el resto.
+
+    Los intervalos cubren [0, 1], el rango de todos los generadores, en lugar del minimo y el maximo
+    de la muestra que usa generate_intervals, que no se conocen hasta el final.
+    """
+    def __init__(self, size: int):
+        if size < 2:
+            raise ValueError("Size must be at least 2.")
+        self.size = size
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0 # suma de cuadrados de las desviaciones a la media
+        self.intervals = sturges_intervals(size)
+        self.frecs = np.zeros(self.intervals, dtype=np.int64)
+        self.hands = dict.fromkeys(POKER_PROBABILITIES, 0)
+        self.chi_2_limit = get_quantile("chi2", 1 - ACCEPTABLE_ERROR, self.intervals - 1)
+        self.poker_limit = get_quantile("chi2", 1 - ACCEPTABLE_ERROR, len(POKER_PROBABILITIES) - 1)
+
+    def update(self, chunk):
+        """
+        :param chunk: Siguientes numeros del bloque
+        """
+        chunk = np.asarray(chunk, dtype=np.float64)
+        n = len(chunk)
+        if n == 0:
+            return
+        if self.count + n > self.size:
+            raise ValueError("More numbers than the accumulator size.")
+        chunk_mean = float(chunk.mean())
+        chunk_m2 = float(np.dot(chunk - chunk_mean, chunk - chunk_mean))
+        delta = chunk_mean - self.mean
+        total = self.count + n
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        interval = np.minimum((chunk * self.intervals).astype(np.int64), self.intervals - 1)
+        self.frecs += np.bincount(interval, minlength=self.intervals)
+        for category, amount in poker_hands(chunk).items():
+            self.hands[category] += amount
+
+    def hopeless(self):
+        """
+        Indica si el bloque ya no puede pasar chi cuadrado o poker, sea cual sea el resto.
+
+        Una frecuencia acumulada solo puede crecer: si ya supera a la esperada, su termino final es al
+        menos el actual, y los demas terminos son positivos; la suma de esos terminos es una cota inferior.
+        """
+        expected = self.size / self.intervals
+        chi_2_bound = float((np.maximum(self.frecs - expected, 0) ** 2).sum() / expected)
+        poker_bound = sum(
+            max(self.hands[category] - probability * self.size, 0) ** 2 / (probability * self.size)
+            for category, probability in POKER_PROBABILITIES.items()
+        )
+        return chi_2_bound > self.chi_2_limit or poker_bound > self.poker_limit
+
+    def results(self, numbers):
+        """
+        Resultado de cada prueba con lo acumulado, en el orden de test_numbers; se detiene en la primera que falla.
+
+        :param numbers: Bloque completo que se acumulo
+        """
+        return self.report(numbers).results()
+
+    def report(self, numbers, conf: dict | None = None, battery=None) -> ValidationReport:
+        """
+        Como results, pero devuelve el informe con el estadistico y el valor critico de cada prueba.
+
+        :param battery: NumbersBattery que decide que pruebas corren, en que orden y en que hilos, y registra
+            sus tiempos; las de SEQUENTIAL_TEST_NAMES no se acumulan y usan el bloque completo. Sin bateria
+            se corren las de test_numbers en su orden original
+        """
+        if self.count != len(numbers):
+            raise ValueError("The accumulator did not receive the whole block.")
+        stats = (self.count, self.mean, self.m2 / self.count)
+        lims = np.linspace(0, 1, self.intervals + 1)
+        data = {"Inters": np.column_stack((lims[:-1], lims[1:])), "Frecs": self.frecs}
+        tests = battery_tests(numbers, stats, data, self.hands)
+        if battery is None:
+            return run_tests(tests, TEST_NAMES, self.count, conf)
+        return battery.run_prepared(tests, self.count, conf)
+
+def accumulate_tests(numbers, chunk_size: int = ACCUMULATOR_CHUNK):
+    """
+    Prueba un bloque por tramos y lo descarta en cuanto deja de poder pasar.
+
+    :return: Resultado de cada prueba, o {"hopeless": False} si se descarto antes de terminar
+    """
+    return accumulate_report(numbers, chunk_size).results()
+
+def accumulate_report(numbers, chunk_size: int = ACCUMULATOR_CHUNK, conf: dict | None = None, battery=None):
+    """
+    Como accumulate_tests, pero devuelve el informe de las pruebas; si el bloque se descarto antes
+    de terminar, el informe no tiene pruebas e indica cuantos numeros se acumularon.
+    """
+    accumulator = NumbersAccumulator(len(numbers))
+    for start in range(0, len(numbers), chunk_size):
+        accumulator.update(numbers[start:start + chunk_size])
+        if accumulator.hopeless():
+            return ValidationReport(conf, len(numbers), [], aborted_at=accumulator.count)
+    return accumulator.report(numbers, conf, battery)
@@ -0,0 +1,112 @@
+from scripts.numbs_aux import SEQUENTIAL_TEST_NAMES, TEST_NAMES, battery_tests, stratified_subsample, subsample_seed
+from scripts.number_generators import generate_block
+from scripts.model_scripts.numbers_report import ValidationReport, run_tests, run_tests_concurrently
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import threading
+
+class NumbersBattery:
+    """
+    Bateria de test_numbers que ordena sus pruebas segun lo medido en los bloques anteriores.
+
+    Cada prueba registra cuantas veces corrio, cuantas rechazo y cuanto tardo. Con salida en el primer
+    rechazo, el tiempo esperado por bloque es minimo si las pruebas van de menor a mayor tiempo medio
+    dividido por la probabilidad de rechazo; un bloque bueno pasa todas en cualquier orden.
+
+    Con `workers` mayor que 0 las pruebas de un bloque corren a la vez en un grupo de hilos propio,
+    que se libera con close.
+    """
+    def __init__(self, names: tuple[str, ...] = TEST_NAMES, workers: int = 0):
+        if workers < 0:
+            raise ValueError("Workers cannot be negative.")
+        unknown = set(names) - set(TEST_NAMES + SEQUENTIAL_TEST_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown tests: {', '.join(sorted(unknown))}.")
+        self.lock = threading.Lock()
+        self.stats = {name: {"runs": 0, "rejections": 0, "time": 0.0} for name in names}
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="battery") if workers else None
+
+    @property
+    def names(self):
+        return tuple(self.stats)
+
+    def order(self):
+        """
+        :return: Nombres de las pruebas en el orden en que conviene correrlas; las que aun no se
+            midieron van primero, en el orden original
+        """
+        with self.lock:
+            return sorted(self.stats, key=lambda name: self.__expected_cost(self.stats[name]))
+
+    def run(self, numbers):
+        """
+        Prueba un bloque en el orden actual y se detiene en la primera prueba que falla.
+
+        :return: Resultado de cada prueba que se corrio, en el orden en que se corrieron
+        """
+        return self.validate(numbers).results()
+
+    def validate(self, numbers, conf: dict | None = None) -> ValidationReport:
+        """
+        Como run, pero devuelve el informe con el estadistico, el valor critico y el tiempo de cada prueba.
+
+        :param conf: Configuracion del generador que produjo el bloque, se guarda en el informe
+        """
+        if self.executor is not None:
+            # los hilos comparten el bloque, ninguna prueba debe poder modificarlo
+            numbers = np.asarray(numbers, dtype=np.float64).view()
+            numbers.flags.writeable = False
+        return self.run_prepared(battery_tests(numbers), len(numbers), conf)
+
+    def run_prepared(self, tests: dict, size: int, conf: dict | None = None) -> ValidationReport:
+        """
+        Corre pruebas ya armadas, por ejemplo con los momentos y frecuencias de NumbersAccumulator,
+        en el orden de la bateria, registrando cada resultado y en sus hilos si los tiene.
+
+        :param tests: Pruebas del bloque, como las devuelve numbs_aux.battery_tests
+        :param size: Cantidad de numeros del bloque
+        """
+        if self.executor is None:
+            return run_tests(tests, self.order(), size, conf, self.record)
+        return run_tests_concurrently(tests, self.order(), size, self.executor, conf, self.record)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def record(self, name: str, passed: bool, elapsed: float):
+        with self.lock:
+            stats = self.stats[name]
+            stats["runs"] += 1
+            stats["rejections"] += not passed
+            stats["time"] += elapsed
+
+    def get_stats(self):
+        """
+        Por prueba: veces que corrio, veces que rechazo, tiempo total y tiempo medio en segundos.
+        """
+        with self.lock:
+            return {
+                name: {**stats, "mean_time": stats["time"] / stats["runs"] if stats["runs"] else 0.0}
+                for name, stats in self.stats.items()
+            }
+
+    @staticmethod
+    def __expected_cost(stats: dict):
+        if stats["runs"] == 0:
+            return 0.0
+        # estimador de Laplace: una prueba que nunca rechazo conserva una probabilidad pequeña
+        rejection = (stats["rejections"] + 1) / (stats["runs"] + 2)
+        return stats["time"] / stats["runs"] / rejection
+
+def validate_candidate(conf: dict, size: int, order, plan: dict | None = None) -> ValidationReport:
+    """
+    Genera y prueba el bloque de una configuracion; pensada para ejecutarse en otro proceso.
+    El informe se puede enviar entre procesos, el bloque no se devuelve porque regenerarlo es mas barato.
+
+    :param plan: Submuestreo a probar en lugar del bloque entero, como lo devuelve numbs_aux.subsample_plan
+    """
+    numbers = generate_block(conf, size)
+    if plan is not None:
+        numbers = stratified_subsample(numbers, plan, subsample_seed(conf))
+    return run_tests(battery_tests(numbers), order, len(numbers), conf)
@@ -1,77 +1,392 @@
-from scripts.numbs_aux import generate_numbers, test_numbers
+from scripts.numbs_aux import SEQUENTIAL_TEST_NAMES, TEST_NAMES, stratified_subsample, subsample_plan, subsample_seed
+from scripts.number_generators import GeneratorBackend, generate_block, get_backend
+from scripts.model_scripts.numbers_accumulator import accumulate_report
+from scripts.model_scripts.numbers_battery import NumbersBattery, validate_candidate
+from scripts.model_scripts.numbers_report import ValidationReport
+from scripts.model_scripts.numbers_store import NumbersStore
+from scripts.model_scripts.numbers_verdicts import VerdictCache
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
 import time
 import threading
 
 G_VALUE = 20
 M_VALUE = 2**G_VALUE
+BLOCK_SIZE = 2**16 # numeros por bloque, 512 KB en float64; una partida consume unos pocos miles
+RING_SIZE = 2 # bloques validados que se mantienen listos
+SLICE_SIZE = 256 # numeros que reserva cada subsecuencia por vez
+REPORTS_KEPT = 64 # informes de validacion recientes que se conservan
 
-class NumbersModel:
-    def __init__(self):
+class NumberStream:
+    """
+    Subsecuencia de un consumidor: reserva tramos contiguos y disjuntos de la secuencia
+    compartida del NumbersModel y los consume con su propio cursor.
+    """
+    def __init__(self, numbers_model: "NumbersModel", slice_size: int = SLICE_SIZE):
+        self.numbers_model = numbers_model
+        self.slice_size = slice_size
         self.numbers = []
-        self.numbers_2 = []
         self.current_number = 0
-        self.using_backup = False
-        self.terminate = False
+        self.lock = threading.Lock() # un mismo consumidor puede pedir numeros desde varios hilos
 
-    def init_numbers(self):
-        if len(self.numbers) > 0 or len(self.numbers_2) > 0:
-            return
-        self.__generate_numbers()
-        self.__generate_numbers(is_backup=True)
-    
     def get_next_pseudo_random_number(self):
-        if not self.using_backup:
+        with self.lock:
             if self.current_number >= len(self.numbers):
-                threading.Thread(target=lambda: self.__generate_numbers(), daemon=True).start()
-                self.current_number = 0
-                self.using_backup = True
-                num = self.numbers_2[self.current_number]
-            else:
-                num = self.numbers[self.current_number]
-        else:
-            if self.current_number >= len(self.numbers_2):
-                threading.Thread(target=lambda: self.__generate_numbers(is_backup=True), daemon=True).start()
+                self.numbers = self.numbers_model.claim_numbers(self.slice_size)
                 self.current_number = 0
-                self.using_backup = False
-                num = self.numbers[self.current_number]
+            num = self.numbers[self.current_number]
+            self.current_number += 1
+            return num
+
+class NumbersModel:
+    def __init__(self, block_size: int = BLOCK_SIZE, ring_size: int = RING_SIZE, store: NumbersStore | None = None,
+                 verdicts: VerdictCache | None = None, search_workers: int = 0,
+                 backend: GeneratorBackend | str = "lcg", incremental: bool = False, subsample: bool = False,
+                 sequential_tests: bool = False, battery_workers: int = 0):
+        if not 0 < block_size <= M_VALUE:
+            raise ValueError(f"Block size must be between 1 and {M_VALUE}.")
+        if ring_size < 1:
+            raise ValueError("Ring size must be at least 1.")
+        if search_workers < 0:
+            raise ValueError("Search workers cannot be negative.")
+        self.block_size = block_size
+        self.backend = get_backend(backend) if isinstance(backend, str) else backend
+        self.ring_size = ring_size
+        self.store = store # bloques validados en sesiones anteriores, evitan generar al iniciar
+        self.verdicts = verdicts # resultados de las pruebas por configuracion, evitan repetirlas
+        # procesos que prueban configuraciones candidatas en paralelo, 0 busca una por una en el hilo de recarga
+        self.search_workers = search_workers
+        self.search_pool: ProcessPoolExecutor | None = None
+        # pruebas de orden (corridas, huecos, autocorrelacion) que se agregan a las de test_numbers
+        self.extra_tests = SEQUENTIAL_TEST_NAMES if sequential_tests else ()
+        # pruebas de los bloques, ordenadas por costo y rechazo medidos
+        # con battery_workers > 0 las pruebas de cada bloque corren a la vez en ese numero de hilos
+        self.battery = NumbersBattery(TEST_NAMES + self.extra_tests, battery_workers)
+        # acumula las pruebas por tramos y descarta antes los bloques que ya no pueden pasar
+        self.incremental = incremental
+        self.reports: deque[ValidationReport] = deque(maxlen=REPORTS_KEPT)
+        # prueba un submuestreo estratificado de tamaño acotado en lugar del bloque entero;
+        # si el submuestreo no es menor que el bloque se prueba el bloque entero
+        plan = subsample_plan(block_size) if subsample else None
+        self.subsample_plan = plan if plan is not None and plan["sample_size"] < block_size else None
+        self.subsample_size = None if self.subsample_plan is None else self.subsample_plan["sample_size"]
+        self.blocks: deque[np.ndarray] = deque() # bloques validados en espera, los llena el hilo de recarga
+        self.numbers = np.empty(0) # bloque que se esta consumiendo
+        self.current_number = 0
+        self.condition = threading.Condition()
+        self.worker: threading.Thread | None = None
+        self.worker_error: BaseException | None = None # error que detuvo al hilo de recarga
+        self.generated_blocks = 0
+        self.loaded_blocks = 0
+        self.consumed_blocks = 0
+        self.waits = 0 # veces que un consumidor encontro el anillo vacio
+        self.wait_time = 0.0
+        self.generation_time = 0.0 # segundos del hilo de recarga buscando bloques validos
+        self.__terminate = False
+        self.streams: dict[str, NumberStream] = {}
+
+    @property
+    def terminate(self):
+        return self.__terminate
+
+    @terminate.setter
+    def terminate(self, value: bool):
+        with self.condition:
+            self.__terminate = value
+            self.condition.notify_all()
+        if value and self.verdicts is not None:
+            self.verdicts.flush()
+
+    def init_numbers(self):
+        with self.condition:
+            self.__start_worker()
+            while not self.blocks and len(self.numbers) == 0 and not self.terminate and self.worker_error is None:
+                self.condition.wait()
+
+    def get_next_pseudo_random_number(self):
+        with self.condition:
+            numbers = self.__active_numbers()
+            num = numbers[self.current_number]
+            self.current_number += 1
+            return num
+
+    def substream(self, name: str) -> NumberStream:
+        """
+        Obtiene la subsecuencia de un consumidor, creandola la primera vez que se pide.
+
+        :param name: Nombre del consumidor (tipo de enemigo, daño, recompensas, etc.)
+        :return: Subsecuencia que no se solapa con la de ningun otro consumidor
+        """
+        stream = self.streams.get(name)
+        if stream is not None:
+            return stream
+        with self.condition:
+            return self.streams.setdefault(name, NumberStream(self))
+
+    def claim_numbers(self, amount: int):
+        """
+        Reserva hasta `amount` numeros contiguos de la secuencia compartida, sin pasar del bloque actual.
+
+        :param amount: Cantidad maxima de numeros a reservar
+        :return: Tramo de numeros que ya no se entregara a ningun otro consumidor
+        """
+        with self.condition:
+            return self.__claim(amount)
+
+    def take(self, amount: int):
+        """
+        Entrega los siguientes `amount` numeros validados de una sola vez.
+
+        :param amount: Cantidad de numeros a tomar
+        :return: Arreglo de solo lectura; es una vista sin copia del bloque salvo cuando
+            los numeros pasan de un bloque al siguiente, en cuyo caso se unen en uno nuevo
+        """
+        if amount < 0:
+            raise ValueError("Amount cannot be negative.")
+        with self.condition:
+            parts = [self.__claim(amount)] if amount else [self.numbers[:0]]
+            taken = len(parts[0])
+            while taken < amount:
+                parts.append(self.__claim(amount - taken))
+                taken += len(parts[-1])
+        if len(parts) == 1:
+            return parts[0]
+        numbers = np.concatenate(parts)
+        numbers.flags.writeable = False
+        return numbers
+
+    def get_stats(self):
+        """
+        Estadisticas del anillo de bloques: bloques generados, cargados del almacen en disco y consumidos, cuantas veces
+        (y cuanto tiempo en segundos) un consumidor tuvo que esperar a que hubiera un bloque listo, el tiempo total
+        buscando bloques validos y los tiempos y rechazos de cada prueba.
+        """
+        with self.condition:
+            return {
+                "generated_blocks": self.generated_blocks,
+                "loaded_blocks": self.loaded_blocks,
+                "consumed_blocks": self.consumed_blocks,
+                "ready_blocks": len(self.blocks),
+                "waits": self.waits,
+                "wait_time": self.wait_time,
+                "generation_time": self.generation_time,
+                "battery": self.battery.get_stats()
+            }
+
+    def get_reports(self):
+        """
+        Informes de validacion de los ultimos bloques probados, aceptados y rechazados, del mas viejo al mas nuevo.
+        Los bloques que se aceptan por el resultado guardado o se cargan del almacen no se prueban y no tienen informe.
+        """
+        with self.condition:
+            return list(self.reports)
+
+    def __claim(self, amount: int):
+        # se llama con self.condition tomado
+        numbers = self.__active_numbers()
+        start = self.current_number
+        self.current_number = min(start + amount, len(numbers))
+        return numbers[start:self.current_number]
+
+    def __active_numbers(self):
+        # se llama con self.condition tomado
+        if self.current_number < len(self.numbers):
+            return self.numbers
+        self.__start_worker()
+        if not self.blocks:
+            self.waits += 1
+            start = time.perf_counter()
+            while not self.blocks and not self.terminate and self.worker_error is None:
+                self.condition.wait()
+            self.wait_time += time.perf_counter() - start
+        if not self.blocks:
+            # nunca se vuelven a entregar numeros de un bloque ya usado
+            if self.worker_error is not None:
+                raise RuntimeError("NumbersModel refill worker failed.") from self.worker_error
+            raise RuntimeError("NumbersModel was terminated and has no numbers left.")
+        self.numbers = self.blocks.popleft()
+        self.current_number = 0
+        self.consumed_blocks += 1
+        self.condition.notify_all()
+        return self.numbers
+
+    def __start_worker(self):
+        # se llama con self.condition tomado
+        if self.worker is None:
+            self.worker = threading.Thread(target=self.__refill_blocks, daemon=True)
+            self.worker.start()
+
+    def __refill_blocks(self):
+        try:
+            self.__refill_loop()
+        except BaseException as error:
+            # los consumidores que esperan un bloque reciben el error en lugar de quedarse bloqueados
+            with self.condition:
+                self.worker_error = error
+                self.condition.notify_all()
+            raise
+        finally:
+            if self.search_pool is not None:
+                self.search_pool.shutdown(wait=False, cancel_futures=True)
+            self.battery.close()
+            if self.verdicts is not None:
+                self.verdicts.flush()
+
+    def __refill_loop(self):
+        self.__use_store(lambda store: store.clean())
+        while True:
+            with self.condition:
+                while len(self.blocks) >= self.ring_size and not self.__store_needs_blocks() and not self.terminate:
+                    self.condition.wait()
+                if self.terminate:
+                    return
+                to_ring = len(self.blocks) < self.ring_size
+            stored = self.__use_store(lambda store: store.pop(
+                size=self.block_size, family=self.backend.family(G_VALUE), tests=self.extra_tests,
+                subsample=self.subsample_size)) if to_ring else None
+            if stored is not None:
+                numbers, _ = stored
+                with self.condition:
+                    self.loaded_blocks += 1
             else:
-                num = self.numbers_2[self.current_number]
-        self.current_number += 1
-        return num
-
-    def __generate_numbers(self, is_backup = False):
-        conf = self.__generate_conf()
-        if self.terminate:
-            return
-        numbers = generate_numbers(conf)
-        if is_backup:
-            self.numbers_2 = numbers
-        else:
-            self.numbers = numbers
-        while not test_numbers(self.numbers) and not self.terminate:
+                start = time.perf_counter()
+                generated = self.__generate_numbers()
+                if generated is None:
+                    return
+                numbers, conf, tests = generated
+                with self.condition:
+                    self.generated_blocks += 1
+                    self.generation_time += time.perf_counter() - start
+                if not to_ring:
+                    # el anillo esta lleno, el bloque queda en disco para la siguiente partida
+                    self.__use_store(lambda store: store.save(numbers, conf, tests, self.subsample_size))
+                    continue
+            # los bloques validados no se modifican, asi se pueden entregar vistas sin copiarlos
+            numbers.flags.writeable = False
+            with self.condition:
+                self.blocks.append(numbers)
+                self.condition.notify_all()
+
+    def __store_needs_blocks(self):
+        return self.__use_store(lambda store: store.is_full()) is False
+
+    def __use_store(self, action):
+        # el almacen es opcional: si el disco falla se desactiva y la recarga sigue solo en memoria
+        store = self.store
+        if store is None:
+            return None
+        try:
+            return action(store)
+        except OSError:
+            self.store = None
+            return None
+
+    def __generate_numbers(self):
+        if self.search_workers > 0:
+            return self.__search_numbers()
+        # solo el primer bloque usa la semilla en segundos, los demas caerian en la misma configuracion
+        conf = self.__generate_conf(first=self.generated_blocks == 0)
+        while True:
+            verdict = self.__known_verdict(conf)
+            if verdict is not False:
+                numbers = generate_block(conf, self.block_size)
+                tests = self.__cached_tests()
+                if verdict is None:
+                    tested = numbers if self.subsample_plan is None else \
+                        stratified_subsample(numbers, self.subsample_plan, subsample_seed(conf))
+                    report = accumulate_report(tested, conf=conf, battery=self.battery) if self.incremental \
+                        else self.battery.validate(tested, conf)
+                    self.__keep_report(report)
+                    tests = report.results()
+                    verdict = report.passed
+                    self.__remember_verdict(conf, verdict)
+                if verdict:
+                    return numbers, conf, tests
             if self.terminate:
-                return
+                return None
             conf = self.__generate_conf(first=False)
-            numbers = generate_numbers(conf)
-            if is_backup:
-                self.numbers_2 = numbers
-            else:
-                self.numbers = numbers
+
+    def __search_numbers(self):
+        """
+        Busqueda especulativa: prueba varias configuraciones a la vez en procesos aparte,
+        se queda con la primera que pasa las pruebas y cancela las que aun no empezaron.
+
+        En Windows y macOS los procesos se crean con spawn e importan de nuevo el paquete scripts;
+        sus __init__ cargan el juego recien cuando se pide, asi los procesos no abren la ventana.
+        """
+        if self.search_pool is None:
+            self.search_pool = ProcessPoolExecutor(max_workers=self.search_workers)
+        pending = {}
+        while not self.terminate:
+            # se mantienen tantas candidatas en curso como procesos
+            while len(pending) < self.search_workers:
+                conf = self.__next_candidate_conf(pending.values())
+                verdict = self.__known_verdict(conf)
+                if verdict:
+                    self.__cancel(pending)
+                    return generate_block(conf, self.block_size), conf, self.__cached_tests()
+                if verdict is None:
+                    pending[self.search_pool.submit(validate_candidate, conf, self.block_size, self.battery.order(),
+                                                    self.subsample_plan)] = conf
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                conf = pending.pop(future)
+                report = future.result()
+                # los tiempos medidos en los procesos tambien ajustan el orden de la bateria
+                for test in report.tests:
+                    self.battery.record(test.name, test.passed, test.elapsed)
+                self.__keep_report(report)
+                tests = report.results()
+                verdict = report.passed
+                self.__remember_verdict(conf, verdict)
+                if verdict:
+                    self.__cancel(pending)
+                    return generate_block(conf, self.block_size), conf, tests
+        self.__cancel(pending)
+        return None
+
+    def __known_verdict(self, conf: dict):
+        if self.verdicts is None:
+            return None
+        return self.verdicts.get(conf, self.block_size, self.extra_tests, self.subsample_size)
+
+    def __remember_verdict(self, conf: dict, verdict: bool):
+        if self.verdicts is not None:
+            self.verdicts.put(conf, self.block_size, verdict, self.extra_tests, self.subsample_size)
+
+    def __cached_tests(self):
+        # resultado que se guarda con un bloque aceptado por un resultado conocido, indica que pruebas cubre
+        return {"verdict_cache": True, **dict.fromkeys(self.extra_tests, True)}
+
+    def __keep_report(self, report: ValidationReport):
+        with self.condition:
+            self.reports.append(report)
+
+    def __next_candidate_conf(self, taken_confs):
+        taken = list(taken_confs)
+        x0 = self.__generate_x0(first=self.generated_blocks == 0 and not taken)
+        conf = self.__conf_from_x0(x0)
+        while conf in taken:
+            x0 = (x0 + 1) % M_VALUE
+            conf = self.__conf_from_x0(x0)
+        return conf
+
+    @staticmethod
+    def __cancel(pending):
+        # las candidatas que ya se estan probando terminan en su proceso y su resultado se ignora
+        for future in pending:
+            future.cancel()
 
     def __generate_conf(self, first = True):
-        x0= self.__generate_x0(first=first)
-        c = 2 * (x0 % (M_VALUE // 2)) + 1
-        k = (x0 + 1) % M_VALUE
-        return {
-            'X0': x0,
-            'k': k,
-            'c': c,
-            'g': G_VALUE
-        }
-    
+        return self.__conf_from_x0(self.__generate_x0(first=first))
+
+    def __conf_from_x0(self, x0):
+        return self.backend.make_conf(x0, G_VALUE)
+
     def __generate_x0(self, first = False):
         x0 = int(time.time()) if first else int(time.time() * 1000000)
         if x0 >= M_VALUE:
             m_size = len(str(M_VALUE))
             x0 = int(str(x0)[-(m_size-1):])
-        return x0
\ No newline at end of file
+        return x0
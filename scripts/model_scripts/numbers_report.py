@@ -0,0 +1,134 @@
+from scripts.numbs_aux import test_p_value
+from concurrent.futures import FIRST_COMPLETED, wait
+import time
+
+class TestReport:
+    """
+    Resultado de una prueba de test_numbers sobre un bloque.
+
+    El p-valor se calcula recien cuando se pide, porque necesita scipy y validar no lo usa.
+    """
+    __test__ = False # pytest no debe tomarla como clase de pruebas
+
+    def __init__(self, name: str, passed: bool, statistic: float, critical: float | tuple[float, float],
+                 size: int, elapsed: float, gl: int | None = None):
+        self.name = name
+        self.passed = bool(passed)
+        self.statistic = float(statistic)
+        self.critical = critical # limite superior, o (inferior, superior) en las pruebas de dos colas
+        self.size = size
+        self.elapsed = elapsed # segundos
+        self.gl = gl
+        self.__p_value: float | None = None
+
+    @property
+    def p_value(self):
+        if self.__p_value is None:
+            self.__p_value = test_p_value(self.name, self.statistic, self.size, self.gl)
+        return self.__p_value
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "passed": self.passed,
+            "statistic": self.statistic,
+            "critical": self.critical,
+            "size": self.size,
+            "elapsed": self.elapsed,
+            "gl": self.gl
+        }
+
+class ValidationReport:
+    """
+    Pruebas que se corrieron sobre un bloque, en orden, con la configuracion del generador.
+    Como la bateria se detiene en la primera prueba que falla, puede no incluir todas; un bloque
+    descartado durante la acumulacion no tiene ninguna y guarda cuantos numeros se llegaron a ver.
+    """
+    def __init__(self, conf: dict | None, size: int, tests: list[TestReport], aborted_at: int | None = None):
+        self.conf = conf
+        self.size = size
+        self.tests = tests
+        self.aborted_at = aborted_at
+
+    @property
+    def passed(self):
+        return len(self.tests) > 0 and all(test.passed for test in self.tests)
+
+    @property
+    def elapsed(self):
+        return sum(test.elapsed for test in self.tests)
+
+    @property
+    def rejected_by(self):
+        """
+        :return: Nombre de la prueba que rechazo el bloque, None si lo acepto
+        """
+        if self.aborted_at is not None:
+            return "hopeless"
+        return next((test.name for test in self.tests if not test.passed), None)
+
+    def results(self):
+        # mismo formato que test_numbers_results, es lo que se guarda con los bloques
+        if self.aborted_at is not None:
+            return {"hopeless": False}
+        return {test.name: test.passed for test in self.tests}
+
+    def to_dict(self):
+        return {
+            "conf": self.conf,
+            "size": self.size,
+            "passed": self.passed,
+            "elapsed": self.elapsed,
+            "aborted_at": self.aborted_at,
+            "tests": [test.to_dict() for test in self.tests]
+        }
+
+def run_tests(tests: dict, order, size: int, conf: dict | None = None, record=None):
+    """
+    Corre las pruebas en el orden dado, midiendo cada una, hasta la primera que falla.
+
+    :param tests: Pruebas del bloque, como las devuelve numbs_aux.battery_tests
+    :param order: Nombres de las pruebas en el orden en que se corren
+    :param size: Cantidad de numeros del bloque
+    :param conf: Configuracion del generador que produjo el bloque
+    :param record: Funcion (nombre, pasa, segundos) que recibe cada resultado, opcional
+    :return: ValidationReport del bloque
+    """
+    reports = []
+    for name in order:
+        reports.append(measure_test(name, tests[name], size, record))
+        if not reports[-1].passed:
+            break
+    return ValidationReport(conf, size, reports)
+
+def run_tests_concurrently(tests: dict, order, size: int, executor, conf: dict | None = None, record=None):
+    """
+    Como run_tests, pero corre las pruebas a la vez en los hilos de `executor`. Las pruebas solo leen
+    el bloque y numpy suelta el GIL en las operaciones grandes, asi que el tiempo de pared se acerca
+    al de la prueba mas lenta. Con la primera que falla se cancelan las que aun no empezaron; las que
+    estan corriendo terminan, pero su resultado no se espera.
+
+    :param executor: ThreadPoolExecutor donde se corren las pruebas, se envian en el orden dado
+    :return: ValidationReport con las pruebas que terminaron, en el orden dado
+    """
+    pending = {executor.submit(measure_test, name, tests[name], size, record) for name in order}
+    reports = {}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            report = future.result()
+            reports[report.name] = report
+        if any(not future.result().passed for future in done):
+            for future in pending:
+                future.cancel()
+            break
+    return ValidationReport(conf, size, [reports[name] for name in order if name in reports])
+
+def measure_test(name: str, test, size: int, record=None) -> TestReport:
+    # corre una prueba de battery_tests midiendo cuanto tarda
+    start = time.perf_counter()
+    passed, statistic, critical, gl = test()
+    elapsed = time.perf_counter() - start
+    if record is not None:
+        record(name, bool(passed), elapsed)
+    return TestReport(name, passed, statistic, critical, size, elapsed, gl)
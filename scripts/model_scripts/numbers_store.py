@@ -0,0 +1,153 @@
+import numpy as np
+import itertools
+import json
+import os
+import threading
+import time
+
+STORE_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'resources', 'numbers_store'))
+STORE_CAPACITY = 4 # bloques validados que se guardan en disco
+STORE_MAGIC = b"NUMSTORE1\n"
+HEADER_SIZE = 512 # bytes reservados para la cabecera, los numeros empiezan en este desplazamiento
+BLOCK_EXTENSION = ".bin"
+USED_EXTENSION = ".used"
+TEMP_EXTENSION = ".tmp"
+STALE_TEMP_AGE = 3600 # segundos tras los cuales un temporal ajeno se considera abandonado
+# un candado por carpeta, compartido por todos los almacenes del proceso que la usan
+folder_locks: dict[str, threading.Lock] = {}
+folder_locks_lock = threading.Lock()
+
+class NumbersStore:
+    """
+    Almacen en disco de bloques de numeros que ya pasaron las pruebas.
+
+    Cada bloque es un archivo con una cabecera JSON de tamaño fijo (configuracion del generador,
+    cantidad de numeros y resultado de las pruebas) seguida de los numeros en float64 crudos,
+    de forma que se pueden mapear en memoria sin leerlos ni volver a validarlos.
+    """
+    def __init__(self, folder: str = STORE_FOLDER, capacity: int = STORE_CAPACITY):
+        self.folder = folder
+        self.capacity = capacity
+        with folder_locks_lock:
+            self.lock = folder_locks.setdefault(os.path.abspath(folder), threading.Lock())
+        self.counter = itertools.count()
+
+    def save(self, numbers: np.ndarray, conf: dict, tests: dict, subsample: int | None = None):
+        """
+        Guarda un bloque validado. La escritura se hace en un archivo temporal que luego se renombra,
+        asi nunca queda a la vista un bloque a medio escribir. La capacidad se vuelve a comprobar justo
+        antes de renombrar, bajo el candado de la carpeta: otro almacen puede haberla llenado mientras
+        tanto, y en ese caso el bloque no se guarda.
+
+        :param numbers: Numeros del bloque
+        :param conf: Configuracion del generador que produjo el bloque
+        :param tests: Resultado de las pruebas del bloque
+        :param subsample: Tamaño del submuestreo que se probo, None si se probo el bloque entero
+        :return: True si el bloque se guardo, False si el almacen ya estaba lleno
+        """
+        header = STORE_MAGIC + json.dumps({
+            "conf": conf,
+            "size": len(numbers),
+            "tests": tests,
+            "subsample": subsample
+        }).encode()
+        if len(header) > HEADER_SIZE:
+            raise ValueError("Block header does not fit in the reserved header size.")
+        os.makedirs(self.folder, exist_ok=True)
+        name = f"block_{time.time_ns()}_{os.getpid()}_{next(self.counter)}"
+        temp_path = os.path.join(self.folder, name + TEMP_EXTENSION)
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(header.ljust(HEADER_SIZE, b" "))
+                f.write(np.ascontiguousarray(numbers, dtype="<f8").tobytes())
+            with self.lock:
+                if len(self.__block_names()) >= self.capacity:
+                    os.remove(temp_path)
+                    return False
+                os.replace(temp_path, os.path.join(self.folder, name + BLOCK_EXTENSION))
+            return True
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def pop(self, size: int | None = None, family: dict | None = None, tests: tuple[str, ...] = (),
+            subsample: int | None = None):
+        """
+        Toma el bloque guardado mas antiguo y lo mapea en memoria en modo solo lectura.
+
+        El archivo se reclama renombrandolo, de modo que un bloque no se entrega dos veces
+        aunque haya otra instancia del juego usando la misma carpeta. Los bloques que no
+        coinciden con el tamaño o el generador pedidos, o que no pasaron todas las pruebas, se descartan.
+
+        :param size: Cantidad de numeros que debe tener el bloque, None acepta cualquiera
+        :param family: Valores que debe tener la configuracion del bloque (generador, g), None acepta cualquiera
+        :param tests: Pruebas que el bloque debe haber pasado ademas de las de test_numbers
+        :param subsample: Tamaño de submuestreo que se acepta; los bloques probados enteros se aceptan siempre
+        :return: Tupla (numeros, cabecera), o None si no hay bloques guardados
+        """
+        with self.lock:
+            for name in self.__block_names():
+                path = os.path.join(self.folder, name)
+                used_path = path[:-len(BLOCK_EXTENSION)] + USED_EXTENSION
+                try:
+                    os.replace(path, used_path)
+                except OSError:
+                    continue # otra instancia lo tomo primero
+                block = self.__map(used_path)
+                if block is not None and self.__matches(block[1], size, family, tests, subsample):
+                    return block
+            return None
+
+    def size(self):
+        with self.lock:
+            return len(self.__block_names())
+
+    def is_full(self):
+        return self.size() >= self.capacity
+
+    def clean(self):
+        """
+        Borra los bloques ya consumidos y los temporales abandonados. En Windows un archivo
+        mapeado no se puede borrar, esos se quedan para la siguiente limpieza.
+        """
+        if not os.path.isdir(self.folder):
+            return
+        for name in os.listdir(self.folder):
+            path = os.path.join(self.folder, name)
+            try:
+                if name.endswith(USED_EXTENSION):
+                    os.remove(path)
+                elif name.endswith(TEMP_EXTENSION):
+                    # un temporal de otra instancia puede estar escribiendose, solo se borra si es viejo
+                    if time.time() - os.path.getmtime(path) > STALE_TEMP_AGE:
+                        os.remove(path)
+            except OSError:
+                pass
+
+    def __block_names(self):
+        if not os.path.isdir(self.folder):
+            return []
+        return sorted(name for name in os.listdir(self.folder) if name.endswith(BLOCK_EXTENSION))
+
+    @staticmethod
+    def __matches(header: dict, size: int | None, family: dict | None, required: tuple[str, ...],
+                  subsample: int | None):
+        tests = header.get("tests")
+        conf = header.get("conf", {})
+        return (size is None or header["size"] == size) and \
+            all(conf.get(name) == value for name, value in (family or {}).items()) and \
+            isinstance(tests, dict) and len(tests) > 0 and all(tests.values()) and \
+            all(name in tests for name in required) and header.get("subsample") in (None, subsample)
+
+    def __map(self, path: str):
+        try:
+            with open(path, "rb") as f:
+                raw_header = f.read(HEADER_SIZE)
+            if not raw_header.startswith(STORE_MAGIC):
+                return None
+            header = json.loads(raw_header[len(STORE_MAGIC):].decode().strip())
+            numbers = np.memmap(path, dtype="<f8", mode="r", offset=HEADER_SIZE, shape=(header["size"],))
+        except (OSError, ValueError, KeyError):
+            return None # bloque dañado o incompleto, se descarta
+        return numbers, header
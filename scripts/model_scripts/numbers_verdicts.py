@@ -0,0 +1,102 @@
+from collections import OrderedDict
+import json
+import os
+import tempfile
+import threading
+import time
+
+VERDICTS_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'resources', 'numbers_verdicts.json'))
+VERDICTS_CAPACITY = 1024 # configuraciones recordadas, se descartan las usadas hace mas tiempo
+FLUSH_INTERVAL = 5.0 # segundos minimos entre escrituras del archivo
+
+class VerdictCache:
+    """
+    Resultado de test_numbers por configuracion del generador, guardado entre partidas.
+
+    La semilla sale de la hora truncada a M_VALUE, asi que las mismas configuraciones vuelven
+    a aparecer; con el resultado guardado una configuracion mala se descarta sin generarla
+    y una buena se acepta sin repetir las pruebas.
+    """
+    def __init__(self, path: str = VERDICTS_PATH, capacity: int = VERDICTS_CAPACITY,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.verdicts: OrderedDict[str, bool] = OrderedDict()
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.last_flush = time.monotonic()
+        self.load()
+
+    @staticmethod
+    def key(conf: dict, size: int, tests: tuple[str, ...] = (), subsample: int | None = None):
+        # el resultado depende tambien del tamaño del bloque, de las pruebas agregadas a la bateria
+        # y de si se probo un submuestreo en lugar del bloque entero
+        key = ":".join(f"{name}={value}" for name, value in sorted(conf.items())) + f":size={size}"
+        if tests:
+            key += f":tests={','.join(sorted(tests))}"
+        return key + f":subsample={subsample}" if subsample is not None else key
+
+    def get(self, conf: dict, size: int, tests: tuple[str, ...] = (), subsample: int | None = None):
+        """
+        :param size: Cantidad de numeros del bloque
+        :param tests: Pruebas que se agregaron a las de test_numbers, como las de SEQUENTIAL_TEST_NAMES
+        :param subsample: Tamaño del submuestreo que se probo, None si se probo el bloque entero
+        :return: True o False si la configuracion ya se probo, None si no se conoce
+        """
+        key = self.key(conf, size, tests, subsample)
+        with self.lock:
+            if key not in self.verdicts:
+                return None
+            self.verdicts.move_to_end(key)
+            return self.verdicts[key]
+
+    def put(self, conf: dict, size: int, verdict: bool, tests: tuple[str, ...] = (), subsample: int | None = None):
+        key = self.key(conf, size, tests, subsample)
+        with self.lock:
+            self.verdicts[key] = bool(verdict)
+            self.verdicts.move_to_end(key)
+            while len(self.verdicts) > self.capacity:
+                self.verdicts.popitem(last=False)
+            self.dirty = True
+            due = time.monotonic() - self.last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                items = json.load(f)
+            entries = [(str(key), bool(verdict)) for key, verdict in items[-self.capacity:]]
+        except (OSError, ValueError, TypeError):
+            return
+        with self.lock:
+            # el archivo se guarda del menos al mas reciente
+            for key, verdict in entries:
+                self.verdicts[key] = verdict
+
+    def flush(self):
+        """
+        Escribe los resultados pendientes. Guardar es opcional: si el archivo no se puede escribir
+        (carpeta de solo lectura, disco lleno) los resultados siguen sirviendo en memoria.
+        """
+        with self.lock:
+            if not self.dirty:
+                return
+            items = list(self.verdicts.items())
+            self.dirty = False
+            self.last_flush = time.monotonic()
+        temp_path = None
+        try:
+            folder = os.path.dirname(self.path)
+            os.makedirs(folder, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=folder, suffix=".tmp", delete=False) as f:
+                temp_path = f.name
+                json.dump(items, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
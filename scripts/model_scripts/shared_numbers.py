@@ -0,0 +1,145 @@
+from multiprocessing import shared_memory
+import multiprocessing
+import numpy as np
+import os
+import threading
+
+SHARED_CAPACITY = 2**18 # numeros del anillo compartido, 2 MB en float64
+PUBLISH_CHUNK = 4096 # numeros que el productor toma del NumbersModel por vez
+CURSOR, PUBLISHED, CLOSED = range(3) # posiciones de la cabecera en la memoria compartida
+HEADER_WORDS = 3
+
+class SharedNumbersPool:
+    """
+    Anillo de numeros validados en memoria compartida entre procesos.
+
+    El proceso que crea el anillo es el unico productor: un hilo toma numeros ya validados de su
+    NumbersModel y los publica. Los procesos consumidores reciben el anillo como argumento al
+    crearse (Process, initializer de un Pool) y reservan tramos disjuntos moviendo un cursor comun
+    bajo la condicion compartida, asi cada numero se genera y se prueba una sola vez por maquina.
+    Tiene claim_numbers como NumbersModel, por lo que un NumberStream puede consumir de el.
+    """
+    def __init__(self, capacity: int = SHARED_CAPACITY, context=None):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        context = context or multiprocessing.get_context()
+        self.capacity = capacity
+        self.condition = context.Condition()
+        self.memory = shared_memory.SharedMemory(create=True, size=8 * (HEADER_WORDS + capacity))
+        self.owner_pid = os.getpid()
+        self.producer: threading.Thread | None = None
+        self.__map()
+        self.header[:] = 0
+
+    def __getstate__(self):
+        # los consumidores se conectan al mismo segmento por nombre, sin copiar los numeros
+        return {"name": self.memory.name, "capacity": self.capacity, "condition": self.condition,
+                "owner_pid": self.owner_pid}
+
+    def __setstate__(self, state):
+        self.capacity = state["capacity"]
+        self.condition = state["condition"]
+        self.memory = shared_memory.SharedMemory(name=state["name"])
+        self.owner_pid = state["owner_pid"]
+        self.producer = None
+        self.__map()
+
+    @property
+    def owner(self):
+        # con fork el anillo llega copiado a los hijos, el dueño se reconoce por el proceso
+        return os.getpid() == self.owner_pid
+
+    def start_producer(self, numbers_model, chunk: int = PUBLISH_CHUNK):
+        """
+        Publica en el anillo los numeros de `numbers_model` desde un hilo del proceso dueño.
+
+        :param numbers_model: Fuente de numeros validados, se consume con take
+        :param chunk: Cantidad maxima de numeros que se publican por vez
+        """
+        if not self.owner:
+            raise RuntimeError("Only the process that created the pool can publish numbers.")
+        if self.producer is None:
+            self.producer = threading.Thread(target=self.__publish, args=(numbers_model, chunk), daemon=True)
+            self.producer.start()
+
+    def claim_numbers(self, amount: int):
+        """
+        Reserva hasta `amount` numeros publicados, esperando si aun no hay ninguno.
+
+        :param amount: Cantidad maxima de numeros a reservar
+        :return: Copia de los numeros reservados, ningun otro consumidor los recibe
+        """
+        with self.condition:
+            while self.header[CURSOR] >= self.header[PUBLISHED]:
+                if self.header[CLOSED]:
+                    raise RuntimeError("SharedNumbersPool was closed and has no numbers left.")
+                self.condition.wait()
+            start = int(self.header[CURSOR])
+            position = start % self.capacity
+            # el tramo no da la vuelta al anillo, los numeros restantes van en la siguiente reserva
+            end = min(start + amount, int(self.header[PUBLISHED]), start + self.capacity - position)
+            # se copia antes de liberar el tramo, despues el productor puede sobrescribirlo
+            numbers = self.numbers[position:position + end - start].copy()
+            self.header[CURSOR] = end
+            self.condition.notify_all()
+        return numbers
+
+    def take(self, amount: int):
+        """
+        :param amount: Cantidad de numeros a tomar
+        :return: Los siguientes `amount` numeros publicados, en un solo arreglo
+        """
+        if amount < 0:
+            raise ValueError("Amount cannot be negative.")
+        parts, taken = [self.numbers[:0].copy()], 0
+        while taken < amount:
+            parts.append(self.claim_numbers(amount - taken))
+            taken += len(parts[-1])
+        return np.concatenate(parts)
+
+    def close(self):
+        """
+        Desconecta el proceso del anillo. En el proceso dueño ademas detiene al productor,
+        despierta a los consumidores que esperan y libera el segmento.
+        """
+        if self.owner:
+            with self.condition:
+                self.header[CLOSED] = 1
+                self.condition.notify_all()
+            if self.producer is not None:
+                self.producer.join()
+        # las vistas de numpy deben soltarse antes de cerrar el segmento
+        del self.header, self.numbers
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __map(self):
+        buffer = self.memory.buf
+        self.header = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=buffer)
+        self.numbers = np.ndarray((self.capacity,), dtype=np.float64, buffer=buffer, offset=8 * HEADER_WORDS)
+
+    def __publish(self, numbers_model, chunk: int):
+        while True:
+            with self.condition:
+                while self.header[PUBLISHED] - self.header[CURSOR] >= self.capacity and not self.header[CLOSED]:
+                    self.condition.wait()
+                if self.header[CLOSED]:
+                    return
+                published = int(self.header[PUBLISHED])
+                position = published % self.capacity
+                free = self.capacity - (published - int(self.header[CURSOR]))
+                amount = min(chunk, free, self.capacity - position)
+            try:
+                # fuera de la condicion: take puede esperar a que se valide un bloque
+                numbers = numbers_model.take(amount)
+            except RuntimeError:
+                # el NumbersModel termino, los consumidores agotan lo publicado y reciben el error
+                with self.condition:
+                    self.header[CLOSED] = 1
+                    self.condition.notify_all()
+                return
+            with self.condition:
+                self.numbers[position:position + amount] = numbers
+                self.header[PUBLISHED] = published + amount
+                self.condition.notify_all()
@@ -1,4 +1,6 @@
-from scripts.model_scripts.montecarlo import montecarlo
+from scripts.model_scripts.montecarlo import AliasSampler, CategoricalSampler, montecarlo
+from collections import Counter
+import pytest
 import sys
 from unittest.mock import MagicMock
 
@@ -33,3 +35,52 @@ def test_sample_with_function_values():
     selected = montecarlo(distribution, 0.1)
     assert callable(selected)
     assert selected() in ["x", "y"]
+
+def test_categorical_sampler_matches_montecarlo():
+    distributions = [
+        [("A", 0.5), ("B", 0.3), ("C", 0.2)],
+        [("A", 0.3), ("B", 0.3), ("C", 0.4)],
+        [("X", 0.4), ("Y", 0.6)],
+        [("A", 0.3), ("B", 0.3)],
+        [("A", 0.1)] * 10
+    ]
+    values = [i / 1000 for i in range(1001)] + [0.3, 0.4, 0.6, 0.8, 0.9]
+    for distribution in distributions:
+        sampler = CategoricalSampler(distribution)
+        assert [sampler.sample(value) for value in values] == [montecarlo(distribution, value) for value in values]
+
+def test_categorical_sampler_boundaries():
+    sampler = CategoricalSampler([("X", 0.4), ("Y", 0.6)])
+    assert sampler.sample(0.0) == "X"
+    assert sampler.sample(0.4) == "Y"
+    assert sampler.sample(1.0) == "Y"
+
+def test_categorical_sampler_rejects_empty_options():
+    with pytest.raises(ValueError):
+        CategoricalSampler([])
+
+def test_alias_sampler_follows_the_montecarlo_distribution():
+    distributions = [
+        [("A", 0.5), ("B", 0.3), ("C", 0.2)],
+        [("A", 0.3), ("B", 0.3)], # lo que falta va al ultimo
+        [("A", 0.7), ("B", 0.7)], # lo que sobra se pierde
+        [(i, 1 / 37) for i in range(37)]
+    ]
+    grid = [(i + 0.5) / 7400 for i in range(7400)]
+    for distribution in distributions:
+        sampler = AliasSampler(distribution)
+        alias_counts = Counter(sampler.sample(value) for value in grid)
+        montecarlo_counts = Counter(montecarlo(distribution, value) for value in grid)
+        assert alias_counts == montecarlo_counts
+
+def test_alias_sampler_columns_and_boundaries():
+    sampler = AliasSampler([("X", 0.25), ("Y", 0.75)])
+    # columna de X: se queda con X la mitad de las veces, la otra mitad va a su alias Y
+    assert sampler.sample(0.1) == "X"
+    assert sampler.sample(0.3) == "Y"
+    assert sampler.sample(0.2, second_value=0.6) == "Y"
+    assert sampler.sample(0.2, second_value=0.4) == "X"
+    assert sampler.sample(1.0) == "Y"
+    assert AliasSampler([("A", 1.0)]).sample(0.7) == "A"
+    with pytest.raises(ValueError):
+        AliasSampler([])
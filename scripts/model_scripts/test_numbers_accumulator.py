@@ -0,0 +1,72 @@
+import sys
+from unittest.mock import MagicMock
+
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+
+import numpy as np
+import pytest
+from scripts import numbs_aux
+from scripts.model_scripts.numbers_accumulator import NumbersAccumulator, accumulate_report, accumulate_tests
+from scripts.model_scripts.numbers_battery import NumbersBattery
+from scripts.model_scripts.numbers_model import NumbersModel
+
+NUMBERS = numbs_aux.generate_numbers({'X0': 123456, 'k': 123457, 'c': 246913, 'g': 20}, size=2**16)
+
+def test_chunked_moments_match_the_whole_block():
+    accumulator = NumbersAccumulator(len(NUMBERS))
+    for size in [1, 999, 5000, 10000, 2**16 - 16000]:
+        accumulator.update(NUMBERS[accumulator.count:accumulator.count + size])
+    n, mean, variance = numbs_aux.sample_moments(NUMBERS)
+    assert accumulator.count == n
+    assert accumulator.mean == pytest.approx(mean, rel=1e-12)
+    assert accumulator.m2 / accumulator.count == pytest.approx(variance, rel=1e-9)
+    assert accumulator.frecs.sum() == n
+    assert accumulator.hands == numbs_aux.poker_hands(NUMBERS)
+
+def test_results_agree_with_the_batch_battery():
+    assert accumulate_tests(NUMBERS, chunk_size=4096) == numbs_aux.test_numbers_results(NUMBERS)
+    assert not all(accumulate_tests(np.full(2**12, 0.5)).values())
+
+def test_hopeless_block_is_dropped_on_the_first_chunk():
+    accumulator = NumbersAccumulator(2**16)
+    accumulator.update(np.linspace(0, 0.1, 8192)) # todos en los primeros intervalos
+    assert accumulator.hopeless()
+    # con todo el bloque en [0, 0.05] los dos primeros intervalos se pasan de lo esperado en el primer tramo
+    assert accumulate_tests(NUMBERS * 0.05) == {"hopeless": False}
+
+def test_good_prefix_is_not_hopeless():
+    accumulator = NumbersAccumulator(len(NUMBERS))
+    accumulator.update(NUMBERS[:8192])
+    assert not accumulator.hopeless()
+
+def test_accumulator_rejects_invalid_use():
+    with pytest.raises(ValueError):
+        NumbersAccumulator(1)
+    accumulator = NumbersAccumulator(10)
+    with pytest.raises(ValueError):
+        accumulator.update(np.zeros(11))
+    accumulator.update(np.zeros(5))
+    with pytest.raises(ValueError):
+        accumulator.results(np.zeros(10))
+
+def test_numbers_model_with_incremental_validation():
+    numbers_model = NumbersModel(block_size=4096, ring_size=1, incremental=True)
+    numbers_model.init_numbers()
+    numbers = numbers_model.take(4096)
+    numbers_model.terminate = True
+    assert len(numbers) == 4096
+    # las pruebas con lo acumulado pasan por la bateria, que mide su costo
+    battery = numbers_model.get_stats()["battery"]
+    assert battery["averages"]["runs"] > 0
+    assert battery["averages"]["time"] > 0
+
+def test_accumulated_report_uses_the_battery_order_and_records_it():
+    battery = NumbersBattery()
+    for name in numbs_aux.TEST_NAMES:
+        battery.stats[name] = {"runs": 10, "rejections": 0, "time": 1.0}
+    battery.stats["poker"] = {"runs": 10, "rejections": 9, "time": 0.0001}
+    report = accumulate_report(NUMBERS, chunk_size=4096, battery=battery)
+    assert report.tests[0].name == "poker"
+    assert battery.get_stats()["poker"]["runs"] == 11
@@ -0,0 +1,128 @@
+import sys
+from unittest.mock import MagicMock
+
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+
+import numpy as np
+import pytest
+import threading
+import time
+from concurrent.futures import Future
+from scripts import numbs_aux
+from scripts.model_scripts.numbers_battery import NumbersBattery
+from scripts.model_scripts.numbers_model import NumbersModel
+from scripts.model_scripts.numbers_report import run_tests_concurrently
+
+NUMBERS = numbs_aux.generate_numbers({'X0': 123456, 'k': 123457, 'c': 246913, 'g': 20}, size=4096)
+
+def test_unmeasured_battery_keeps_original_order():
+    battery = NumbersBattery()
+    assert battery.order() == list(numbs_aux.TEST_NAMES)
+    assert battery.run(NUMBERS) == numbs_aux.test_numbers_results(NUMBERS)
+
+def test_cheap_rejecting_tests_move_first():
+    battery = NumbersBattery()
+    for _ in range(10):
+        battery.record("averages", True, 0.01)
+        battery.record("variance", True, 0.01)
+        battery.record("chi_2", True, 0.05)
+        battery.record("ks", True, 0.05)
+        battery.record("poker", False, 0.01)
+    assert battery.order()[0] == "poker"
+    assert battery.order()[-2:] == ["chi_2", "ks"]
+
+def test_run_stops_at_first_failure_and_records_timings():
+    battery = NumbersBattery()
+    rejected = np.full(4096, 0.5)
+    results = battery.run(rejected)
+    assert results == {"averages": True, "variance": False}
+    stats = battery.get_stats()
+    assert stats["variance"]["runs"] == 1 and stats["variance"]["rejections"] == 1
+    assert stats["averages"]["time"] > 0 and stats["averages"]["mean_time"] == stats["averages"]["time"]
+    assert stats["poker"]["runs"] == 0 and stats["poker"]["mean_time"] == 0.0
+
+def test_numbers_model_reports_battery_and_generation_time():
+    numbers_model = NumbersModel(block_size=4096, ring_size=1)
+    numbers_model.init_numbers()
+    numbers_model.take(10)
+    stats = numbers_model.get_stats()
+    numbers_model.terminate = True
+    assert stats["generation_time"] > 0
+    assert stats["battery"]["averages"]["runs"] >= 1
+
+def test_battery_accepts_sequential_tests_and_rejects_unknown_ones():
+    battery = NumbersBattery(numbs_aux.TEST_NAMES + numbs_aux.SEQUENTIAL_TEST_NAMES)
+    assert battery.names == numbs_aux.TEST_NAMES + numbs_aux.SEQUENTIAL_TEST_NAMES
+    report = battery.validate(np.random.default_rng(3).random(4096))
+    assert [test.name for test in report.tests] == list(battery.names)
+    with pytest.raises(ValueError):
+        NumbersBattery(("averages", "spectral"))
+
+def test_numbers_model_with_sequential_tests():
+    numbers_model = NumbersModel(block_size=4096, ring_size=1, sequential_tests=True)
+    numbers_model.init_numbers()
+    numbers_model.take(10)
+    numbers_model.terminate = True
+    # el bloque entregado paso todas las pruebas, incluidas las de orden
+    passed = [report for report in numbers_model.get_reports() if report.passed]
+    assert passed
+    assert {test.name for test in passed[0].tests} == set(numbs_aux.TEST_NAMES + numbs_aux.SEQUENTIAL_TEST_NAMES)
+
+def test_concurrent_battery_matches_sequential_report():
+    battery = NumbersBattery(numbs_aux.TEST_NAMES + numbs_aux.SEQUENTIAL_TEST_NAMES, workers=4)
+    try:
+        report = battery.validate(NUMBERS)
+    finally:
+        battery.close()
+    expected = NumbersBattery(numbs_aux.TEST_NAMES + numbs_aux.SEQUENTIAL_TEST_NAMES).validate(NUMBERS)
+    assert [test.name for test in report.tests] == [test.name for test in expected.tests]
+    assert [test.statistic for test in report.tests] == [test.statistic for test in expected.tests]
+    assert report.passed == expected.passed
+
+class ManualExecutor:
+    # guarda las pruebas enviadas, el test decide cuando corre cada una
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, function, *args):
+        future = Future()
+        self.submitted.append((future, function, args))
+        return future
+
+    def run(self, index):
+        future, function, args = self.submitted[index]
+        future.set_running_or_notify_cancel()
+        future.set_result(function(*args))
+
+def test_concurrent_tests_cancel_pending_ones_on_first_failure():
+    tests = {
+        "averages": lambda: (True, 0.5, (0.4, 0.6), None),
+        "variance": lambda: (False, 0.2, (0.08, 0.09), 4095),
+        "chi_2": lambda: (True, 1.0, 2.0, 1)
+    }
+    executor = ManualExecutor()
+    report = None
+    def run():
+        nonlocal report
+        report = run_tests_concurrently(tests, ("averages", "variance", "chi_2"), 4096, executor)
+    runner = threading.Thread(target=run)
+    runner.start()
+    while len(executor.submitted) < 3:
+        time.sleep(0.001)
+    executor.run(1)
+    runner.join(timeout=5)
+    assert not runner.is_alive()
+    assert executor.submitted[0][0].cancelled() and executor.submitted[2][0].cancelled()
+    assert report.rejected_by == "variance"
+    assert [test.name for test in report.tests] == ["variance"]
+
+def test_numbers_model_with_battery_workers():
+    numbers_model = NumbersModel(block_size=4096, ring_size=1, battery_workers=2)
+    numbers_model.init_numbers()
+    assert len(numbers_model.take(10)) == 10
+    numbers_model.terminate = True
+    assert any(report.passed for report in numbers_model.get_reports())
+    with pytest.raises(ValueError):
+        NumbersBattery(workers=-1)
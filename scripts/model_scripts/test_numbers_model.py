@@ -0,0 +1,174 @@
+import sys
+from unittest.mock import MagicMock, patch
+
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+
+import multiprocessing
+import numpy as np
+import pytest
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from scripts.model_scripts.numbers_battery import validate_candidate
+from scripts.model_scripts.numbers_model import NumbersModel
+from scripts import numbs_aux
+
+def numbers_model_with(numbers):
+    # evita generar y validar bloques reales en las pruebas
+    numbers_model = NumbersModel()
+    numbers_model.numbers = np.array(numbers)
+    return numbers_model
+
+def test_substream_is_reused_by_name():
+    numbers_model = numbers_model_with([0.1, 0.2])
+    assert numbers_model.substream("damage") is numbers_model.substream("damage")
+    assert numbers_model.substream("damage") is not numbers_model.substream("walks")
+
+def test_substreams_do_not_overlap():
+    numbers_model = numbers_model_with(np.arange(1000) / 1000)
+    damage = numbers_model.substream("damage")
+    walks = numbers_model.substream("walks")
+    damage.slice_size = walks.slice_size = 10
+    drawn_damage, drawn_walks = [], []
+    for _ in range(15):
+        drawn_damage.append(damage.get_next_pseudo_random_number())
+        drawn_walks.append(walks.get_next_pseudo_random_number())
+    assert drawn_damage == [i / 1000 for i in list(range(0, 10)) + list(range(20, 25))]
+    assert drawn_walks == [i / 1000 for i in list(range(10, 20)) + list(range(30, 35))]
+
+def test_claim_numbers_stops_at_block_end():
+    numbers_model = numbers_model_with([0.1, 0.2, 0.3])
+    numbers_model.current_number = 2
+    assert numbers_model.claim_numbers(5).tolist() == [0.3]
+
+def test_init_numbers_uses_configured_block_size():
+    numbers_model = NumbersModel(block_size=4096)
+    numbers_model.init_numbers()
+    numbers_model.get_next_pseudo_random_number()
+    assert numbers_model.numbers.dtype == np.float64
+    assert len(numbers_model.numbers) == 4096
+    numbers_model.terminate = True
+
+def test_init_numbers_with_generator_backend():
+    numbers_model = NumbersModel(block_size=4096, backend="pcg")
+    numbers_model.init_numbers()
+    numbers = numbers_model.take(4096)
+    assert numbs_aux.test_numbers(np.array(numbers))
+    numbers_model.terminate = True
+
+def test_subsample_validation_tests_a_bounded_sample():
+    numbers_model = NumbersModel(block_size=2**17, ring_size=1, subsample=True)
+    numbers_model.init_numbers()
+    numbers_model.take(10)
+    reports = numbers_model.get_reports()
+    numbers_model.terminate = True
+    assert numbers_model.subsample_plan["sample_size"] < 2**17
+    assert all(report.size == numbers_model.subsample_plan["sample_size"] for report in reports)
+
+def test_subsample_verdict_is_the_same_for_the_same_conf():
+    conf = {'X0': 123456, 'k': 123457, 'c': 246913, 'g': 20}
+    plan = numbs_aux.subsample_plan(2**17)
+    reports = [validate_candidate(conf, 2**17, numbs_aux.TEST_NAMES, plan) for _ in range(2)]
+    assert [test.statistic for test in reports[0].tests] == [test.statistic for test in reports[1].tests]
+    # un submuestreo que cubre el bloque entero equivale a probarlo entero
+    assert NumbersModel(block_size=4096, subsample=True).subsample_plan is None
+
+def test_search_worker_under_spawn_does_not_load_the_game():
+    # con spawn (Windows, macOS) cada proceso importa de nuevo el paquete scripts
+    conf = {'X0': 123456, 'k': 123457, 'c': 246913, 'g': 20}
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        report = pool.submit(validate_candidate, conf, 4096, numbs_aux.TEST_NAMES).result(timeout=60)
+        loaded = pool.submit(eval, "[name for name in __import__('sys').modules if name in ('pygame', "
+                                   "'scripts.game_configs', 'scripts.game_controller')]").result(timeout=60)
+    assert report.results() == numbs_aux.test_numbers_results(numbs_aux.generate_numbers(conf, size=4096))
+    assert loaded == []
+
+def test_invalid_generator_backend():
+    with pytest.raises(ValueError):
+        NumbersModel(backend="mersenne")
+
+def test_invalid_block_size():
+    with pytest.raises(ValueError):
+        NumbersModel(block_size=0)
+    with pytest.raises(ValueError):
+        NumbersModel(ring_size=0)
+
+def test_concurrent_claims_are_disjoint_across_refills():
+    numbers_model = NumbersModel(block_size=1024, ring_size=1)
+    claimed = []
+    def consumer():
+        for _ in range(20):
+            claimed.append(numbers_model.claim_numbers(100))
+    threads = [threading.Thread(target=consumer) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    numbers_model.terminate = True
+    # cada tramo es una vista de un bloque; dentro de un bloque los tramos no se solapan
+    by_block: dict[int, list[range]] = {}
+    for numbers in claimed:
+        offset = (numbers.__array_interface__['data'][0] - numbers.base.__array_interface__['data'][0]) // 8
+        by_block.setdefault(id(numbers.base), []).append(range(offset, offset + len(numbers)))
+    for ranges in by_block.values():
+        positions = [i for r in ranges for i in r]
+        assert len(positions) == len(set(positions))
+    assert all(0 < len(numbers) <= 100 for numbers in claimed)
+    stats = numbers_model.get_stats()
+    assert stats["consumed_blocks"] >= 8
+    assert stats["waits"] >= 1
+
+def test_terminate_wakes_waiting_consumer_without_recycling_numbers():
+    numbers_model = NumbersModel(block_size=1024)
+    numbers_model.numbers = np.array([0.5])
+    assert numbers_model.get_next_pseudo_random_number() == 0.5
+    numbers_model.terminate = True
+    with pytest.raises(RuntimeError):
+        numbers_model.get_next_pseudo_random_number()
+
+def test_worker_failure_reaches_waiting_consumers():
+    numbers_model = NumbersModel(block_size=1024)
+    with patch('scripts.model_scripts.numbers_model.generate_block', side_effect=MemoryError), \
+         patch('threading.excepthook'):
+        numbers_model.init_numbers()
+        with pytest.raises(RuntimeError):
+            numbers_model.get_next_pseudo_random_number()
+    assert isinstance(numbers_model.worker_error, MemoryError)
+
+def test_take_returns_read_only_view_inside_a_block():
+    numbers_model = numbers_model_with(np.arange(10) / 10)
+    numbers_model.numbers.flags.writeable = False
+    numbers = numbers_model.take(4)
+    assert numbers.tolist() == [0.0, 0.1, 0.2, 0.3]
+    assert numbers.base is numbers_model.numbers
+    assert not numbers.flags.writeable
+    assert numbers_model.take(0).tolist() == []
+    assert numbers_model.get_next_pseudo_random_number() == 0.4
+
+def test_take_wraps_around_blocks():
+    numbers_model = numbers_model_with([0.1, 0.2, 0.3])
+    numbers_model.current_number = 1
+    numbers_model.blocks.extend([np.array([0.4, 0.5]), np.array([0.6, 0.7])])
+    numbers = numbers_model.take(5)
+    assert numbers.tolist() == [0.2, 0.3, 0.4, 0.5, 0.6]
+    assert not numbers.flags.writeable
+    assert numbers_model.get_next_pseudo_random_number() == 0.7
+    numbers_model.terminate = True
+
+def test_parallel_search_returns_validated_block():
+    numbers_model = NumbersModel(block_size=1024, ring_size=1, search_workers=2)
+    numbers_model.init_numbers()
+    numbers = numbers_model.take(1024)
+    assert len(numbers) == 1024
+    assert numbs_aux.test_numbers(np.array(numbers))
+    assert numbers_model.search_pool is not None
+    # los informes de los procesos se registran en la bateria, que ajusta su orden con ellos
+    battery = numbers_model.get_stats()["battery"]
+    assert battery["averages"]["runs"] > 0
+    assert battery["averages"]["time"] > 0
+    numbers_model.terminate = True
+
+def test_invalid_search_workers():
+    with pytest.raises(ValueError):
+        NumbersModel(search_workers=-1)
@@ -0,0 +1,68 @@
+import sys
+from unittest.mock import MagicMock
+
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+
+import json
+import numpy as np
+import pickle
+import pytest
+from scripts import numbs_aux
+from scripts.model_scripts.numbers_battery import NumbersBattery, validate_candidate
+from scripts.model_scripts.numbers_accumulator import accumulate_report
+from scripts.model_scripts.numbers_model import NumbersModel
+
+CONF = {'X0': 123456, 'k': 123457, 'c': 246913, 'g': 20}
+NUMBERS = numbs_aux.generate_numbers(CONF, size=4096)
+
+def test_report_has_statistic_critical_value_and_time_per_test():
+    report = NumbersBattery().validate(NUMBERS, CONF)
+    assert report.conf == CONF and report.size == 4096
+    assert report.results() == numbs_aux.test_numbers_results(NUMBERS)
+    assert [test.name for test in report.tests] == list(numbs_aux.TEST_NAMES)
+    averages = report.tests[0]
+    assert averages.statistic == pytest.approx(NUMBERS.mean())
+    low, high = averages.critical
+    assert low < 0.5 < high
+    assert all(test.elapsed >= 0 for test in report.tests)
+    assert report.elapsed == pytest.approx(sum(test.elapsed for test in report.tests))
+    json.dumps(report.to_dict())
+
+def test_p_values_match_scipy():
+    from scipy.stats import chi2, norm
+    report = NumbersBattery().validate(NUMBERS)
+    tests = {test.name: test for test in report.tests}
+    assert tests["averages"].p_value == pytest.approx(2 * norm.sf(abs(NUMBERS.mean() - 0.5) * np.sqrt(12 * 4096)))
+    assert tests["chi_2"].p_value == pytest.approx(chi2.sf(tests["chi_2"].statistic, tests["chi_2"].gl))
+    assert 0 <= tests["variance"].p_value <= 1 and 0 <= tests["ks"].p_value <= 1
+    # una prueba aceptada tiene p-valor mayor que alfa en las pruebas de chi cuadrado
+    assert tests["poker"].p_value > numbs_aux.ACCEPTABLE_ERROR
+
+def test_rejected_report_names_the_failing_test():
+    report = NumbersBattery().validate(np.full(4096, 0.5))
+    assert not report.passed
+    assert report.rejected_by == "variance"
+    assert report.results() == {"averages": True, "variance": False}
+
+def test_aborted_accumulation_report():
+    report = accumulate_report(NUMBERS * 0.05, chunk_size=1024, conf=CONF)
+    assert not report.passed and report.tests == []
+    assert report.aborted_at == 1024
+    assert report.rejected_by == "hopeless"
+    assert report.results() == {"hopeless": False}
+
+def test_candidate_report_can_cross_processes():
+    report = pickle.loads(pickle.dumps(validate_candidate(CONF, 4096, numbs_aux.TEST_NAMES)))
+    assert report.results() == numbs_aux.test_numbers_results(NUMBERS)
+
+def test_numbers_model_keeps_recent_reports():
+    numbers_model = NumbersModel(block_size=4096, ring_size=1)
+    numbers_model.init_numbers()
+    numbers_model.take(10)
+    reports = numbers_model.get_reports()
+    numbers_model.terminate = True
+    assert len(reports) >= 1
+    assert any(report.passed for report in reports)
+    assert all(report.conf['backend'] == "lcg" for report in reports)
@@ -0,0 +1,130 @@
+import sys
+from unittest.mock import MagicMock
+
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+
+import numpy as np
+import os
+import threading
+import time
+from scripts import numbs_aux
+from scripts.model_scripts.numbers_store import NumbersStore
+from scripts.model_scripts.numbers_model import NumbersModel
+
+CONF = {'X0': 1, 'k': 2, 'c': 3, 'g': 20, 'backend': 'lcg'}
+PASSED = {"averages": True, "variance": True, "chi_2": True, "ks": True, "poker": True}
+
+def test_save_and_pop_maps_block_read_only(tmp_path):
+    store = NumbersStore(folder=str(tmp_path), capacity=2)
+    store.save(np.array([0.1, 0.2, 0.3]), CONF, {"averages": True, "poker": True})
+    assert store.size() == 1
+    numbers, header = store.pop()
+    assert numbers.tolist() == [0.1, 0.2, 0.3]
+    assert not numbers.flags.writeable
+    assert header["conf"] == CONF
+    assert header["tests"] == {"averages": True, "poker": True}
+    # un bloque tomado no se vuelve a entregar
+    assert store.size() == 0
+    assert store.pop() is None
+
+def test_pop_returns_blocks_in_saving_order_and_skips_damaged(tmp_path):
+    store = NumbersStore(folder=str(tmp_path), capacity=3)
+    with open(os.path.join(tmp_path, "block_0.bin"), "wb") as f:
+        f.write(b"not a block")
+    store.save(np.array([0.5]), CONF, PASSED)
+    store.save(np.array([0.7]), CONF, PASSED)
+    assert store.is_full()
+    assert store.pop()[0].tolist() == [0.5]
+    assert store.pop()[0].tolist() == [0.7]
+    assert store.pop() is None
+
+def test_clean_removes_consumed_blocks(tmp_path):
+    store = NumbersStore(folder=str(tmp_path))
+    store.save(np.array([0.5]), CONF, PASSED)
+    numbers, _ = store.pop()
+    del numbers
+    store.clean()
+    assert os.listdir(tmp_path) == []
+
+def test_numbers_model_starts_from_stored_block_and_refills_store(tmp_path):
+    store = NumbersStore(folder=str(tmp_path), capacity=2)
+    store.save(np.full(1024, 0.25), CONF, PASSED)
+    numbers_model = NumbersModel(block_size=1024, ring_size=1, store=store)
+    numbers_model.init_numbers()
+    assert numbers_model.get_next_pseudo_random_number() == 0.25
+    assert numbers_model.get_stats()["loaded_blocks"] == 1
+    # con el anillo lleno el hilo de recarga llena el almacen con bloques nuevos
+    deadline = time.time() + 30
+    while not store.is_full() and time.time() < deadline:
+        time.sleep(0.01)
+    numbers_model.terminate = True
+    assert store.size() == 2
+
+def test_pop_discards_blocks_that_do_not_match(tmp_path):
+    store = NumbersStore(folder=str(tmp_path), capacity=4)
+    store.save(np.full(64, 0.1), CONF, PASSED)
+    store.save(np.full(128, 0.2), {**CONF, 'g': 22}, PASSED)
+    store.save(np.full(128, 0.3), CONF, {"averages": True, "poker": False})
+    store.save(np.full(128, 0.4), CONF, PASSED)
+    numbers, _ = store.pop(size=128, family={'backend': 'lcg', 'g': 20})
+    assert numbers[0] == 0.4
+    assert store.size() == 0
+
+def test_pop_requires_the_extra_tests(tmp_path):
+    store = NumbersStore(folder=str(tmp_path), capacity=4)
+    store.save(np.full(128, 0.1), CONF, PASSED)
+    store.save(np.full(128, 0.2), CONF, {**PASSED, "runs": True, "gap": True, "autocorrelation": True})
+    numbers, _ = store.pop(size=128, tests=numbs_aux.SEQUENTIAL_TEST_NAMES)
+    assert numbers[0] == 0.2
+    assert store.size() == 0
+
+def test_pop_only_accepts_subsampled_blocks_when_asked(tmp_path):
+    store = NumbersStore(folder=str(tmp_path), capacity=4)
+    store.save(np.full(128, 0.1), CONF, PASSED, subsample=64)
+    store.save(np.full(128, 0.2), CONF, PASSED)
+    store.save(np.full(128, 0.3), CONF, PASSED, subsample=64)
+    numbers, _ = store.pop(size=128)
+    assert numbers[0] == 0.2
+    numbers, header = store.pop(size=128, subsample=64)
+    assert numbers[0] == 0.3 and header["subsample"] == 64
+
+def test_stores_sharing_a_folder_never_exceed_capacity(tmp_path):
+    stores = [NumbersStore(folder=str(tmp_path), capacity=4) for _ in range(6)]
+    # todos ven el almacen sin llenar antes de guardar, como hilos de recarga que comprueban a la vez
+    assert not any(store.is_full() for store in stores)
+    threads = [threading.Thread(target=store.save, args=(np.full(1024, 0.5), CONF, PASSED)) for store in stores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stores[0].size() == 4
+    assert stores[0].save(np.full(8, 0.5), CONF, PASSED) is False
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+def test_clean_keeps_recent_temporary_files(tmp_path):
+    store = NumbersStore(folder=str(tmp_path))
+    recent = os.path.join(tmp_path, "block_1_2_3.tmp")
+    stale = os.path.join(tmp_path, "block_4_5_6.tmp")
+    for path in (recent, stale):
+        with open(path, "wb") as f:
+            f.write(b"")
+    os.utime(stale, (time.time() - 2 * 3600, time.time() - 2 * 3600))
+    store.clean()
+    assert os.listdir(tmp_path) == ["block_1_2_3.tmp"]
+
+def test_numbers_model_disables_unwritable_store(tmp_path):
+    blocker = os.path.join(tmp_path, "afile")
+    with open(blocker, "w") as f:
+        f.write("")
+    store = NumbersStore(folder=os.path.join(blocker, "store"), capacity=2)
+    numbers_model = NumbersModel(block_size=1024, ring_size=1, store=store)
+    numbers_model.init_numbers()
+    deadline = time.time() + 30
+    while numbers_model.store is not None and time.time() < deadline:
+        time.sleep(0.01)
+    # sin almacen la recarga sigue funcionando en memoria
+    assert numbers_model.store is None
+    numbers_model.take(3000)
+    numbers_model.terminate = True
@@ -0,0 +1,88 @@
+import sys
+from unittest.mock import MagicMock, patch
+
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+
+import numpy as np
+import os
+from scripts.model_scripts.numbers_verdicts import VerdictCache
+from scripts.model_scripts.numbers_model import NumbersModel
+
+GOOD_CONF = {'X0': 10, 'k': 11, 'c': 21, 'g': 20}
+BAD_CONF = {'X0': 20, 'k': 21, 'c': 41, 'g': 20}
+
+def test_verdicts_are_persisted(tmp_path):
+    path = os.path.join(tmp_path, "verdicts.json")
+    verdicts = VerdictCache(path=path)
+    verdicts.put(GOOD_CONF, 1024, True)
+    verdicts.put(BAD_CONF, 1024, False)
+    verdicts.flush()
+    loaded = VerdictCache(path=path)
+    assert loaded.get(GOOD_CONF, 1024) is True
+    assert loaded.get(BAD_CONF, 1024) is False
+    assert loaded.get(GOOD_CONF, 2048) is None
+
+def test_verdicts_with_extra_tests_are_kept_apart(tmp_path):
+    verdicts = VerdictCache(path=os.path.join(tmp_path, "verdicts.json"))
+    verdicts.put(GOOD_CONF, 1024, True)
+    assert verdicts.get(GOOD_CONF, 1024, ("runs", "gap")) is None
+    verdicts.put(GOOD_CONF, 1024, False, ("runs", "gap"))
+    assert verdicts.get(GOOD_CONF, 1024, ("gap", "runs")) is False
+    assert verdicts.get(GOOD_CONF, 1024) is True
+
+def test_subsample_verdicts_are_kept_apart_from_whole_block_ones(tmp_path):
+    verdicts = VerdictCache(path=os.path.join(tmp_path, "verdicts.json"))
+    subsampled = NumbersModel(block_size=2**17, subsample=True, verdicts=verdicts)
+    whole = NumbersModel(block_size=2**15, verdicts=verdicts)
+    assert subsampled.subsample_size == 2**15
+    subsampled._NumbersModel__remember_verdict(GOOD_CONF, True)
+    assert whole._NumbersModel__known_verdict(GOOD_CONF) is None
+    assert verdicts.get(GOOD_CONF, 2**17) is None
+    assert verdicts.get(GOOD_CONF, 2**17, subsample=2**15) is True
+
+def test_least_recently_used_verdict_is_evicted(tmp_path):
+    path = os.path.join(tmp_path, "verdicts.json")
+    verdicts = VerdictCache(path=path, capacity=2)
+    verdicts.put(GOOD_CONF, 1, True)
+    verdicts.put(GOOD_CONF, 2, True)
+    verdicts.get(GOOD_CONF, 1)
+    verdicts.put(GOOD_CONF, 3, True)
+    verdicts.flush()
+    assert verdicts.get(GOOD_CONF, 2) is None
+    assert verdicts.get(GOOD_CONF, 1) is True
+    assert VerdictCache(path=path, capacity=2).get(GOOD_CONF, 2) is None
+
+def test_numbers_model_skips_known_bad_and_trusts_known_good(tmp_path):
+    verdicts = VerdictCache(path=os.path.join(tmp_path, "verdicts.json"))
+    verdicts.put(BAD_CONF, 1024, False)
+    verdicts.put(GOOD_CONF, 1024, True)
+    numbers_model = NumbersModel(block_size=1024, ring_size=1, verdicts=verdicts)
+    with patch.object(numbers_model, '_NumbersModel__generate_conf', side_effect=[BAD_CONF, GOOD_CONF]), \
+         patch('scripts.model_scripts.numbers_model.generate_block', wraps=lambda conf, size: [conf['X0']] * size) as generate, \
+         patch.object(numbers_model.battery, 'validate') as test:
+        numbers, conf, tests = numbers_model._NumbersModel__generate_numbers()
+    assert conf == GOOD_CONF
+    assert numbers == [10] * 1024
+    assert tests == {"verdict_cache": True}
+    generate.assert_called_once_with(GOOD_CONF, 1024)
+    test.assert_not_called()
+
+def test_unwritable_path_keeps_verdicts_in_memory(tmp_path):
+    blocker = os.path.join(tmp_path, "afile")
+    with open(blocker, "w") as f:
+        f.write("")
+    verdicts = VerdictCache(path=os.path.join(blocker, "x", "verdicts.json"), flush_interval=0)
+    verdicts.put(GOOD_CONF, 1024, True)
+    verdicts.flush()
+    assert verdicts.get(GOOD_CONF, 1024) is True
+
+def test_verdicts_are_written_on_flush_not_on_every_put(tmp_path):
+    path = os.path.join(tmp_path, "verdicts.json")
+    verdicts = VerdictCache(path=path, flush_interval=3600)
+    verdicts.put(GOOD_CONF, 1024, np.bool_(True))
+    assert not os.path.exists(path)
+    verdicts.flush()
+    assert VerdictCache(path=path).get(GOOD_CONF, 1024) is True
+    assert os.listdir(tmp_path) == ["verdicts.json"]
@@ -0,0 +1,97 @@
+import sys
+from unittest.mock import MagicMock
+
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+
+import multiprocessing
+import numpy as np
+import pytest
+import threading
+from scripts.model_scripts.numbers_model import NumberStream
+from scripts.model_scripts.shared_numbers import SharedNumbersPool
+
+CONTEXT = multiprocessing.get_context()
+
+class CountingNumbers:
+    # fuente de numeros consecutivos en lugar de un NumbersModel, asi se puede verificar cada reserva
+    def __init__(self, limit=None):
+        self.next_number = 0
+        self.limit = limit
+
+    def take(self, amount):
+        if self.limit is not None and self.next_number >= self.limit:
+            raise RuntimeError("terminated")
+        numbers = np.arange(self.next_number, self.next_number + amount, dtype=np.float64)
+        self.next_number += amount
+        return numbers
+
+def consume(pool, amount, queue):
+    stream = NumberStream(pool, slice_size=7)
+    queue.put([stream.get_next_pseudo_random_number() for _ in range(amount)])
+    pool.close()
+
+def test_claims_are_disjoint_and_ordered_within_the_ring():
+    pool = SharedNumbersPool(capacity=10, context=CONTEXT)
+    pool.start_producer(CountingNumbers(), chunk=4)
+    assert pool.take(25).tolist() == list(range(25))
+    assert pool.claim_numbers(3).tolist() == [25, 26, 27]
+    pool.close()
+
+def test_consumer_processes_share_one_producer():
+    pool = SharedNumbersPool(capacity=64, context=CONTEXT)
+    pool.start_producer(CountingNumbers(), chunk=16)
+    queue = CONTEXT.Queue()
+    consumers = [CONTEXT.Process(target=consume, args=(pool, 300, queue)) for _ in range(3)]
+    for consumer in consumers:
+        consumer.start()
+    drawn = [queue.get(timeout=60) for _ in consumers]
+    for consumer in consumers:
+        consumer.join(timeout=60)
+    pool.close()
+    numbers = [number for numbers in drawn for number in numbers]
+    assert len(numbers) == 900
+    assert len(set(numbers)) == 900
+
+def test_closed_pool_raises_after_published_numbers():
+    pool = SharedNumbersPool(capacity=8, context=CONTEXT)
+    pool.start_producer(CountingNumbers(limit=5), chunk=5)
+    assert pool.take(5).tolist() == [0, 1, 2, 3, 4]
+    with pytest.raises(RuntimeError):
+        pool.claim_numbers(1)
+    pool.close()
+
+def test_terminated_producer_wakes_waiting_consumer():
+    pool = SharedNumbersPool(capacity=8, context=CONTEXT)
+    errors = []
+    def consumer():
+        try:
+            pool.claim_numbers(1)
+        except RuntimeError as error:
+            errors.append(error)
+    thread = threading.Thread(target=consumer)
+    thread.start()
+    pool.start_producer(CountingNumbers(limit=0))
+    thread.join(timeout=5)
+    assert not thread.is_alive() and len(errors) == 1
+    pool.close()
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        SharedNumbersPool(capacity=0)
+
+def test_spawned_consumers_attach_without_loading_the_game():
+    # con spawn (Windows, macOS) el hijo importa de nuevo el paquete scripts; sin pygame instalado
+    # el hijo terminaria con error si la importacion llegara a game_configs
+    spawn = multiprocessing.get_context("spawn")
+    pool = SharedNumbersPool(capacity=64, context=spawn)
+    pool.start_producer(CountingNumbers(), chunk=16)
+    consumers = [spawn.Process(target=pool.take, args=(100,)) for _ in range(2)]
+    for consumer in consumers:
+        consumer.start()
+    for consumer in consumers:
+        consumer.join(timeout=60)
+    assert [consumer.exitcode for consumer in consumers] == [0, 0]
+    assert pool.take(5).tolist() == [200, 201, 202, 203, 204]
+    pool.close()
@@ -0,0 +1,154 @@
+import numpy as np
+
+GENERATION_CHUNK = 1024 # numeros calculados por fila en la generacion vectorizada
+XORSHIFT_LANES = 1024 # secuencias xorshift que avanzan a la vez, la salida las intercala
+PCG_MULTIPLIER = 6364136223846793005
+
+def affine_states(a, c, m, x0, size):
+    """
+    Estados X_1..X_size de la recurrencia X_{i+1} = (a * X_i + c) mod m, con m potencia de 2 hasta 2^64.
+
+    Se calculan los coeficientes (A_j, C_j) de una fila y las semillas de cada fila, y todo el bloque
+    sale de una sola multiplicacion y suma en uint64; al ser m potencia de 2 el desborde de uint64
+    no altera el residuo modulo m.
+    """
+    if size == 0:
+        return np.empty(0, dtype=np.uint64)
+    chunk = min(GENERATION_CHUNK, size)
+    # coeficientes (A_j, C_j) tales que X_{n+j} = (A_j * X_n + C_j) mod m, para j = 1..chunk
+    A, C = [], []
+    A_j, C_j = 1, 0
+    for j in range(chunk):
+        A_j = (a * A_j) % m
+        C_j = (a * C_j + c) % m
+        A.append(A_j)
+        C.append(C_j)
+    # semillas de cada fila: X_0, X_chunk, X_2chunk, ...
+    rows = -(-size // chunk)
+    starts = []
+    X_i = x0
+    for i in range(rows):
+        starts.append(X_i)
+        X_i = (A_j * X_i + C_j) % m
+    states = np.array(starts, dtype=np.uint64)[:, None] * np.array(A, dtype=np.uint64) + np.array(C, dtype=np.uint64)
+    return (states & np.uint64(m - 1)).ravel()[:size]
+
+def splitmix64(seeds):
+    # mezcla semillas consecutivas en estados de 64 bits bien distribuidos
+    z = np.asarray(seeds, dtype=np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+class GeneratorBackend:
+    """
+    Generador de numeros pseudoaleatorios que usa NumbersModel.
+
+    make_conf arma la configuracion a partir de una semilla y generate produce el bloque
+    de forma vectorizada; la configuracion incluye el nombre del generador para poder
+    reconstruir el bloque desde ella (procesos de busqueda, almacen en disco).
+    """
+    name = ""
+
+    def make_conf(self, seed: int, g: int) -> dict:
+        raise NotImplementedError
+
+    def generate(self, conf: dict, size: int) -> np.ndarray:
+        raise NotImplementedError
+
+    def family(self, g: int) -> dict:
+        # datos de la configuracion que deben coincidir para reutilizar un bloque guardado
+        return {'backend': self.name, 'g': g}
+
+class LcgBackend(GeneratorBackend):
+    """Congruencial mixto del curso: a = 1 + 2k, c impar, m = 2^g."""
+    name = "lcg"
+
+    def make_conf(self, seed, g):
+        m = 2**g
+        return {'X0': seed % m, 'k': (seed + 1) % m, 'c': 2 * (seed % (m // 2)) + 1, 'g': g, 'backend': self.name}
+
+    def generate(self, conf, size):
+        m = 2**conf['g']
+        states = affine_states(1 + 2*conf['k'], conf['c'], m, conf['X0'], size)
+        return states.astype(np.float64) / float(m - 1)
+
+class McgBackend(GeneratorBackend):
+    """Congruencial multiplicativo: a = 8k + 5, X0 impar, m = 2^g; periodo m/4."""
+    name = "mcg"
+
+    def make_conf(self, seed, g):
+        m = 2**g
+        return {'X0': (seed % m) | 1, 'a': (8 * seed + 5) % m, 'g': g, 'backend': self.name}
+
+    def generate(self, conf, size):
+        m = 2**conf['g']
+        states = affine_states(conf['a'], 0, m, conf['X0'], size)
+        return states.astype(np.float64) / float(m)
+
+class XorshiftBackend(GeneratorBackend):
+    """
+    Xorshift64 (13, 7, 17). No tiene salto afin, asi que se vectoriza corriendo XORSHIFT_LANES
+    secuencias con semillas distintas a la vez; el bloque intercala sus salidas.
+    """
+    name = "xorshift"
+
+    def family(self, g):
+        return {'backend': self.name}
+
+    def make_conf(self, seed, g):
+        return {'seed': seed, 'backend': self.name}
+
+    def generate(self, conf, size):
+        lanes = min(XORSHIFT_LANES, max(size, 1))
+        x = splitmix64(np.arange(lanes, dtype=np.uint64) + np.uint64(conf['seed'] * XORSHIFT_LANES % 2**64))
+        x[x == 0] = 1 # el estado 0 es un punto fijo
+        rows = -(-size // lanes)
+        out = np.empty((rows, lanes), dtype=np.uint64)
+        for i in range(rows):
+            x ^= x << np.uint64(13)
+            x ^= x >> np.uint64(7)
+            x ^= x << np.uint64(17)
+            out[i] = x
+        # los 53 bits altos llenan la mantisa de un float64 en [0, 1)
+        return (out.ravel()[:size] >> np.uint64(11)).astype(np.float64) * 2.0**-53
+
+class PcgBackend(GeneratorBackend):
+    """
+    PCG32 (XSH RR): congruencial de 64 bits con permutacion de salida. Los estados salen de
+    affine_states como en el LCG y la permutacion se aplica a todo el bloque a la vez.
+    """
+    name = "pcg"
+
+    def family(self, g):
+        return {'backend': self.name}
+
+    def make_conf(self, seed, g):
+        return {'state': int(splitmix64([seed])[0]), 'inc': (2 * seed + 1) % 2**64, 'backend': self.name}
+
+    def generate(self, conf, size):
+        # la salida i usa el estado anterior al paso i, como en la implementacion de referencia
+        states = np.empty(size, dtype=np.uint64)
+        if size:
+            states[0] = conf['state']
+            states[1:] = affine_states(PCG_MULTIPLIER, conf['inc'], 2**64, conf['state'], size - 1)
+        xorshifted = (((states >> np.uint64(18)) ^ states) >> np.uint64(27)) & np.uint64(0xFFFFFFFF)
+        rot = states >> np.uint64(59)
+        out = ((xorshifted >> rot) | (xorshifted << ((np.uint64(32) - rot) & np.uint64(31)))) & np.uint64(0xFFFFFFFF)
+        return out.astype(np.float64) / 2.0**32
+
+BACKENDS: dict[str, GeneratorBackend] = {
+    backend.name: backend for backend in (LcgBackend(), McgBackend(), XorshiftBackend(), PcgBackend())
+}
+
+def get_backend(name: str) -> GeneratorBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown generator backend: {name}. Available: {', '.join(BACKENDS)}.")
+    return BACKENDS[name]
+
+def generate_block(conf: dict, size: int) -> np.ndarray:
+    """
+    Genera el bloque de una configuracion con el generador que indica; las configuraciones
+    sin 'backend' son del congruencial mixto original.
+    """
+    return get_backend(conf.get('backend', LcgBackend.name)).generate(conf, size)
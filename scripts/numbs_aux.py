@@ -1,129 +1,471 @@
-from scipy.stats import chi2, norm
 import math
+import threading
 import numpy as np
-import pandas as pd
 import json
 import os
+import zlib
+from scripts.number_generators import affine_states
 
 ACCEPTABLE_ERROR = 0.05 # alfa
 ACCEPTABLE_PERCENT = 0.95 # aceptation percent
 ks_values_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..' ,'resources', 'jsons', 'ks_values.json'))
-ks_values = []
+ks_table = None # valores criticos de KS indexados por n, se cargan al primer uso
+quantiles_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..' ,'resources', 'jsons', 'quantiles.json'))
+quantile_values = {} # (distribucion, q, gl) -> cuantil, la tabla se carga al primer uso
+MAX_G = 64 # los estados se calculan en uint64
+STREAM_CHUNK = 2**16 # numeros por tramo en stream_numbers
+TEST_NAMES = ("averages", "variance", "chi_2", "ks", "poker") # orden original de test_numbers
+SEQUENTIAL_TEST_NAMES = ("runs", "gap", "autocorrelation") # pruebas de orden, opcionales en la bateria
+GAP_RANGE = (0.0, 0.5) # intervalo cuyas apariciones separan los huecos de la prueba de huecos
+GAP_CATEGORIES = 10 # huecos de longitud 0 a GAP_CATEGORIES - 1, y uno mas para los mas largos
+GAP_MIN_EXPECTED = 5 # huecos esperados como minimo en la categoria de los mas largos
+AUTOCORRELATION_LAG = 1
+SUBSAMPLE_CONFIDENCE = 0.99
+SUBSAMPLE_TOLERANCE = 0.01 # distancia maxima entre la distribucion del submuestreo y la del bloque
+SUBSAMPLE_WINDOWS = 4 # tramos contiguos que se agregan al submuestreo
+SUBSAMPLE_WINDOW_SIZE = 1024
 
-def get_ks_value(n):
-    if not ks_values:
+def load_ks_table():
+    global ks_table
+    if ks_table is None:
         with open(ks_values_path, 'r') as f:
             values = json.load(f)
-        ks_values.extend(values)
-    for value in ks_values:
-        if value["n"] == n:
-            return value["value"]
+        table = np.full(max(value["n"] for value in values) + 1, np.nan)
+        for value in values:
+            table[value["n"]] = value["value"]
+        ks_table = table
+    return ks_table
+
+def get_ks_value(n):
+    table = load_ks_table()
+    if 0 <= n < len(table) and not np.isnan(table[n]):
+        return float(table[n])
     return None
 
-def generate_numbers(conf):
-    a = 1 + 2*conf['k']
+def get_quantile(distribution, q, df=None):
+    """
+    Cuantil `q` de la normal estandar ("norm") o de chi cuadrado ("chi2") con `df` grados de libertad.
+
+    Los valores que usan las pruebas con los tamaños de bloque habituales estan precalculados en
+    quantiles.json; solo los parametros que no estan en la tabla se calculan, y guardan, con scipy.
+    """
+    if not quantile_values:
+        with open(quantiles_path, 'r') as f:
+            values = json.load(f)
+        quantile_values.update({(value["distribution"], round(value["q"], 10), value["df"]): value["value"] for value in values})
+    key = (distribution, round(q, 10), df)
+    if key not in quantile_values:
+        from scipy.stats import chi2, norm
+        quantile_values[key] = float(norm.ppf(q) if distribution == "norm" else chi2.ppf(q, df))
+    return quantile_values[key]
+
+def lcg_jump(a, c, m, steps):
+    # coeficientes (A, C) tales que X_{n+steps} = (A * X_n + C) mod m, por elevacion al cuadrado: O(log steps)
+    A, C = 1, 0
+    a_p, c_p = a, c  # transformacion afin aplicada 2^i veces
+    while steps > 0:
+        if steps & 1:
+            A, C = (a_p * A) % m, (a_p * C + c_p) % m
+        c_p = (a_p * c_p + c_p) % m
+        a_p = (a_p * a_p) % m
+        steps >>= 1
+    return A, C
+
+def jump_ahead(conf, steps):
+    """
+    Avanza la configuracion del generador `steps` posiciones sin generar los numeros intermedios.
+
+    :param conf: Configuracion (X0, k, c, g) del generador
+    :param steps: Cantidad de posiciones a saltar
+    :return: Nueva configuracion cuyo X0 es el estado X_steps de la secuencia original
+    """
+    m = 2**conf['g']
+    A, C = lcg_jump(1 + 2*conf['k'], conf['c'], m, steps)
+    return {**conf, 'X0': (A * conf['X0'] + C) % m}
+
+def lcg_period(conf):
+    """
+    Cantidad de numeros distintos que recorre la secuencia antes de repetirse.
+
+    a = 1 + 2k es impar, asi que la recurrencia permuta los estados modulo 2^g y el ciclo de X0
+    mide una potencia de 2: basta probar saltos de 1, 2, 4, ... hasta volver a X0.
+
+    :param conf: Configuracion (X0, k, c, g) del generador
+    :return: Periodo de la secuencia que empieza en X0
+    """
+    a, c, m = 1 + 2*conf['k'], conf['c'], 2**conf['g']
+    period = 1
+    while period < m:
+        A, C = lcg_jump(a, c, m, period)
+        if (A * conf['X0'] + C) % m == conf['X0']:
+            return period
+        period *= 2
+    return m
+
+def generate_numbers(conf, offset=0, size=None):
+    if conf['g'] > MAX_G:
+        raise ValueError(f"g cannot be greater than {MAX_G}.")
     m = 2**conf['g']
-    numbers = []
-    X_i_minus_1 = conf['X0']
-    for i in range(1, (m//2)+1):
-        X_i = ((a * X_i_minus_1) + conf['c']) % m
-        X_i_minus_1 = X_i
-        R_i = X_i / (m - 1)
-        numbers.append(R_i)
-    return numbers
+    if size is None:
+        size = (m // 2) - offset
+    if offset < 0 or size < 0:
+        raise ValueError("Offset and size cannot be negative.")
+    # con offset la secuencia arranca en R_{offset+1}, sin calcular los numeros anteriores
+    X0 = jump_ahead(conf, offset)['X0'] if offset else conf['X0']
+    states = affine_states(1 + 2*conf['k'], conf['c'], m, X0, size)
+    return states.astype(np.float64) / float(m - 1)
+
+def stream_numbers(conf, chunk_size=STREAM_CHUNK, offset=0, limit=None):
+    """
+    Genera la secuencia por tramos, con memoria constante aunque g sea grande (hasta MAX_G).
+
+    El estado se lleva en uint64 y cada tramo continua desde el ultimo estado del anterior. La
+    secuencia se corta al completar el periodo, asi una sesion larga nunca recibe numeros repetidos.
+
+    :param conf: Configuracion (X0, k, c, g) del generador
+    :param chunk_size: Cantidad maxima de numeros por tramo
+    :param offset: Posiciones que se saltan antes del primer tramo
+    :param limit: Cantidad maxima de numeros a entregar, None entrega hasta completar el periodo
+    :return: Generador de arreglos float64 consecutivos en la secuencia
+    """
+    if conf['g'] > MAX_G:
+        raise ValueError(f"g cannot be greater than {MAX_G}.")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("Offset and limit cannot be negative.")
+    a, m = 1 + 2*conf['k'], 2**conf['g']
+    remaining = max(lcg_period(conf) - offset, 0)
+    if limit is not None:
+        remaining = min(remaining, limit)
+    X_i = jump_ahead(conf, offset)['X0'] if offset else conf['X0']
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        states = affine_states(a, conf['c'], m, X_i, size)
+        X_i = int(states[-1])
+        remaining -= size
+        yield states.astype(np.float64) / float(m - 1)
 
 def test_numbers(numbers):
-    return averages_test(numbers) and variance_test(numbers) and chi_2_test(numbers) and ks_test(numbers) and poker_test(numbers)
+    return all(test_numbers_results(numbers).values())
+
+def battery_tests(numbers, stats=None, intervals=None, hands=None):
+    """
+    Pruebas de test_numbers sobre un bloque, como funciones sin argumentos que se pueden correr
+    en cualquier orden. Los momentos y el histograma se calculan una sola vez, al llegar a la
+    primera prueba que los usa, salvo que ya vengan calculados. Incluye las pruebas de orden de
+    SEQUENTIAL_TEST_NAMES, que solo corren si se piden.
+
+    :return: Diccionario nombre de la prueba -> funcion que devuelve (pasa, estadistico, valor critico, gl)
+    """
+    numbers = np.asarray(numbers, dtype=np.float64)
+    shared = {"stats": stats, "intervals": intervals}
+    # las pruebas pueden correr a la vez en varios hilos
+    locks = {"stats": threading.Lock(), "intervals": threading.Lock()}
+    def moments():
+        with locks["stats"]:
+            if shared["stats"] is None:
+                shared["stats"] = sample_moments(numbers)
+            return shared["stats"]
+    def histogram():
+        with locks["intervals"]:
+            if shared["intervals"] is None:
+                shared["intervals"] = generate_intervals(numbers)
+            return shared["intervals"]
+    return {
+        "averages": lambda: averages_measure(numbers, moments()),
+        "variance": lambda: variance_measure(numbers, moments()),
+        "chi_2": lambda: chi_2_measure(numbers, histogram()),
+        "ks": lambda: ks_measure(numbers, histogram()),
+        "poker": lambda: poker_measure(numbers, hands),
+        "runs": lambda: runs_measure(numbers),
+        "gap": lambda: gap_measure(numbers),
+        "autocorrelation": lambda: autocorrelation_measure(numbers)
+    }
+
+def test_numbers_results(numbers, order=TEST_NAMES):
+    # resultado de cada prueba en el orden pedido; se detiene en la primera que falla
+    tests = battery_tests(numbers)
+    results = {}
+    for name in order:
+        results[name] = bool(tests[name]()[0])
+        if not results[name]:
+            break
+    return results
+
+def subsample_plan(size, confidence=SUBSAMPLE_CONFIDENCE, tolerance=SUBSAMPLE_TOLERANCE,
+                   windows=SUBSAMPLE_WINDOWS, window_size=SUBSAMPLE_WINDOW_SIZE):
+    """
+    Tamaños del submuestreo estratificado de un bloque de `size` numeros.
+
+    Por la desigualdad de Dvoretzky-Kiefer-Wolfowitz, con n >= ln(2 / (1 - confidence)) / (2 tolerance^2)
+    numeros la distribucion empirica del submuestreo esta a menos de `tolerance` de la del bloque con
+    probabilidad `confidence`. El total se redondea a una potencia de 2 para que los cuantiles de la
+    prueba de varianza esten en la tabla precalculada; si no es menor que el bloque se prueba entero.
+
+    :return: Diccionario con la cantidad de estratos, de ventanas y su tamaño, el total y la garantia pedida
+    """
+    if not 0 < confidence < 1 or tolerance <= 0:
+        raise ValueError("Confidence must be between 0 and 1 and tolerance must be positive.")
+    strata = math.ceil(math.log(2 / (1 - confidence)) / (2 * tolerance ** 2))
+    sample_size = 2 ** math.ceil(math.log2(strata + windows * window_size))
+    if sample_size >= size:
+        return {"strata": size, "windows": 0, "window_size": 0, "sample_size": size,
+                "confidence": 1.0, "tolerance": 0.0}
+    return {"strata": sample_size - windows * window_size, "windows": windows, "window_size": window_size,
+            "sample_size": sample_size, "confidence": confidence, "tolerance": tolerance}
+
+def stratified_subsample(numbers, plan, seed=None):
+    """
+    Toma un numero al azar de cada uno de plan["strata"] tramos iguales del bloque, en orden, y le agrega
+    plan["windows"] ventanas contiguas en posiciones al azar, que conservan la estructura secuencial.
+
+    :param plan: Tamaños, como los devuelve subsample_plan
+    :param seed: Semilla de la eleccion de posiciones, None usa una distinta cada vez
+    """
+    numbers = np.asarray(numbers, dtype=np.float64)
+    if plan["sample_size"] >= len(numbers):
+        return numbers
+    rng = np.random.default_rng(seed)
+    bounds = np.linspace(0, len(numbers), plan["strata"] + 1).astype(np.int64)
+    positions = bounds[:-1] + (rng.random(plan["strata"]) * (bounds[1:] - bounds[:-1])).astype(np.int64)
+    starts = rng.integers(0, len(numbers) - plan["window_size"] + 1, size=plan["windows"])
+    windows = [numbers[start:start + plan["window_size"]] for start in starts]
+    return np.concatenate([numbers[positions]] + windows)
+
+def subsample_seed(conf):
+    """
+    Semilla del submuestreo de un bloque, fija para cada configuracion del generador: asi el resultado
+    de probar una configuracion no depende de que posiciones se eligieron y se puede guardar.
+    """
+    return zlib.crc32(json.dumps(conf, sort_keys=True).encode())
+
+def test_subsample_results(numbers, confidence=SUBSAMPLE_CONFIDENCE, tolerance=SUBSAMPLE_TOLERANCE, seed=None):
+    """
+    Como test_numbers_results, pero sobre un submuestreo estratificado cuyo tamaño depende de la
+    confianza pedida y no del tamaño del bloque.
 
-def averages_test(nums):
+    :return: Tupla (resultado de cada prueba, plan del submuestreo con la garantia que ofrece)
+    """
+    plan = subsample_plan(len(numbers), confidence, tolerance)
+    return test_numbers_results(stratified_subsample(numbers, plan, seed)), plan
+
+def sample_moments(nums):
+    """
+    Tamaño, media y varianza poblacional de la muestra en una sola pasada vectorizada
+    (suma y suma de cuadrados), sin recorrer los numeros en Python.
+
+    :param nums: Lista o arreglo de numeros
+    :return: Tupla (n, media, varianza)
+    """
+    nums = np.asarray(nums, dtype=np.float64)
     n = len(nums)
-    r = sum(nums) / n
+    mean = float(nums.sum()) / n
+    # con numeros en [0, 1] la varianza (~1/12) no se pierde por cancelacion frente a la media al cuadrado
+    variance = max(float(np.dot(nums, nums)) / n - mean * mean, 0.0)
+    return n, mean, variance
+
+# las funciones *_measure devuelven (pasa, estadistico, valor critico, grados de libertad);
+# el valor critico es un limite superior o un par (inferior, superior) en las pruebas de dos colas
+
+def averages_test(nums, stats=None):
+    return averages_measure(nums, stats)[0]
+
+def averages_measure(nums, stats=None):
+    n, r, _ = stats or sample_moments(nums)
     one_min_alfa_mid = 1 - (ACCEPTABLE_ERROR / 2)
-    z = float(norm.ppf(one_min_alfa_mid))
+    z = get_quantile("norm", one_min_alfa_mid)
     li = 0.5 - z * (1 / math.sqrt(12 * n))
     ls = 0.5 + z * (1 / math.sqrt(12 * n))
-    return li <= r <= ls
+    return li <= r <= ls, r, (li, ls), None
 
-def variance_test(nums):
-    n = len(nums)
-    r = sum(nums) / n
-    variance = sum((x - r) ** 2 for x in nums) / n
+def variance_test(nums, stats=None):
+    return variance_measure(nums, stats)[0]
+
+def variance_measure(nums, stats=None):
+    n, _, variance = stats or sample_moments(nums)
     alfa_mid = ACCEPTABLE_ERROR / 2
     one_min_alfa_mid = 1 - alfa_mid
     gl = n - 1
-    chi_2_alfa_mid = float(chi2.ppf(1 - alfa_mid, gl))
-    chi_2_one_min_alfa_mid = float(chi2.ppf(1 - one_min_alfa_mid, gl))
+    chi_2_alfa_mid = get_quantile("chi2", 1 - alfa_mid, gl)
+    chi_2_one_min_alfa_mid = get_quantile("chi2", 1 - one_min_alfa_mid, gl)
     li = chi_2_alfa_mid / (12 * (n-1))
     ls = chi_2_one_min_alfa_mid / (12 * (n-1))
-    return li >= variance >= ls
+    return li >= variance >= ls, variance, (ls, li), gl
 
-def chi_2_test(nums):
+def chi_2_test(nums, data=None):
+    return chi_2_measure(nums, data)[0]
+
+def chi_2_measure(nums, data=None):
     n = len(nums)
-    data = generate_intervals(nums)
+    data = data or generate_intervals(nums)
     intervals = data["Inters"]
     frecuencies = data["Frecs"]
-    expected_frecuencies = [n / len(intervals) for i in range(0, len(intervals))]
-    chi_2_values = [
-        ((frecuencies[i] - expected_frecuencies[i]) ** 2) / expected_frecuencies[i]
-        for i in range(len(intervals))
-    ]
-    chi_2_statistic = sum(chi_2_values)
+    expected_frecuency = n / len(intervals)
+    chi_2_statistic = float((((frecuencies - expected_frecuency) ** 2) / expected_frecuency).sum())
     gl = len(intervals) - 1
-    chi_inv_value = float(chi2.ppf(1-ACCEPTABLE_ERROR, gl))
-    return chi_2_statistic <= chi_inv_value
+    chi_inv_value = get_quantile("chi2", 1 - ACCEPTABLE_ERROR, gl)
+    return chi_2_statistic <= chi_inv_value, chi_2_statistic, chi_inv_value, gl
+
+def ks_test(nums, data=None):
+    return ks_measure(nums, data)[0]
 
-def ks_test(nums):
+def ks_measure(nums, data=None):
     n = len(nums)
-    data = generate_intervals(nums)
+    data = data or generate_intervals(nums)
     intervals = data["Inters"]
     F_observed = data["Frecs"]
-    F_obt_acum = [sum(F_observed[0:i+1] if i < len(F_observed) -1 else F_observed) for i in range(0, len(F_observed))]
-    P_obt = [F_obt_acum[i] / n for i in range(0, len(F_obt_acum))]
-    frec_exp = n / len(intervals)
-    F_expected_acum = [frec_exp * (i+1) for i in range(0, len(F_observed))]
-    P_expected_acum = [F_expected_acum[i] / n for i in range(0, len(F_expected_acum))]
-    differences = [abs(P_obt[i] - P_expected_acum[i]) for i in range(0, len(P_obt))]
-    D_max = max(differences)
+    # acumuladas observadas y esperadas en O(k); con intervalos iguales la esperada es i/k
+    P_obt = np.cumsum(F_observed) / n
+    P_expected_acum = np.arange(1, len(intervals) + 1) / len(intervals)
+    D_max = float(np.abs(P_obt - P_expected_acum).max())
     D_critical = get_ks_value(n) if n <= 50 else 1.36 / math.sqrt(n)
-    return D_max <= D_critical
+    return D_max <= D_critical, D_max, D_critical, None
+
+POKER_PROBABILITIES = {"TD": 0.3024, "1P": 0.5040, "2P": 0.1080, "1T": 0.0720, "F": 0.0090, "P": 0.0045, "Q": 0.0001}
+# mano segun (digitos distintos, repeticiones del digito mas repetido)
+POKER_HANDS = {
+    (5, 1): "TD", # Todos diferentes
+    (4, 2): "1P", # Un par
+    (3, 2): "2P", # Dos pares
+    (3, 3): "1T", # Un trío
+    (2, 3): "F", # Full
+    (2, 4): "P", # Póker
+    (1, 5): "Q", # Quintilla
+}
+
+def poker_hands(nums):
+    """
+    Cuenta las manos de poker de los 5 primeros decimales de cada numero.
+
+    Los digitos salen de int(num * 100000) con divisiones enteras y un bincount por fila da cuantas
+    veces aparece cada digito; la mano queda definida por los digitos distintos y el maximo de
+    repeticiones. Un 1.0 tiene 6 cifras y, como en la version con cadenas, no cuenta en ninguna mano.
+
+    :return: Cantidad de numeros de cada categoria (TD, 1P, 2P, 1T, F, P, Q)
+    """
+    ints = (np.asarray(nums, dtype=np.float64) * 100000).astype(np.int64)
+    ints = ints[(ints >= 0) & (ints < 100000)]
+    digits = (ints[:, None] // 10 ** np.arange(5)) % 10
+    rows = len(ints)
+    counts = np.bincount((np.arange(rows)[:, None] * 10 + digits).ravel(), minlength=rows * 10).reshape(rows, 10)
+    hands = np.bincount((counts > 0).sum(axis=1) * 10 + counts.max(axis=1, initial=0), minlength=60)
+    return {category: int(hands[distinct * 10 + repeated]) for (distinct, repeated), category in POKER_HANDS.items()}
 
-def poker_test(nums):
+def poker_test(nums, categories=None):
+    return poker_measure(nums, categories)[0]
+
+def poker_measure(nums, categories=None):
     n = len(nums)
-    str_nums = [f'{int(num * 100000):05}' for num in nums]
-    categories = {"TD": 0, "1P": 0, "2P": 0, "1T": 0, "F": 0, "P": 0, "Q": 0}
-    for num in str_nums:
-        counts = {digit: num.count(digit) for digit in set(num)}
-        count_values = sorted(counts.values(), reverse=True)
-        if count_values == [1, 1, 1, 1, 1]:
-            categories["TD"] += 1  # Todos diferentes
-        elif count_values == [2, 1, 1, 1]:
-            categories["1P"] += 1  # Un par
-        elif count_values == [2, 2, 1]:
-            categories["2P"] += 1  # Dos pares
-        elif count_values == [3, 1, 1]:
-            categories["1T"] += 1  # Un trío
-        elif count_values == [3, 2]:
-            categories["F"] += 1  # Full
-        elif count_values == [4, 1]:
-            categories["P"] += 1  # Póker
-        elif count_values == [5]:
-            categories["Q"] += 1  # Quintilla
-    expected_probs = {"TD": 0.3024, "1P": 0.5040, "2P": 0.1080, "1T": 0.0720, "F": 0.0090, "P": 0.0045, "Q": 0.0001}
-    expected_freqs = {cat: expected_probs[cat] * n for cat in categories}
+    categories = categories or poker_hands(nums)
+    expected_freqs = {cat: POKER_PROBABILITIES[cat] * n for cat in categories}
     error_values = [(categories[cat] - expected_freqs[cat])**2 / expected_freqs[cat] for cat in categories]
     errors_sum = sum(error_values)
     gl = len(categories) - 1
-    chi_inv_value = chi2.ppf(1 - ACCEPTABLE_ERROR, gl)
-    return errors_sum <= chi_inv_value
+    chi_inv_value = get_quantile("chi2", 1 - ACCEPTABLE_ERROR, gl)
+    return errors_sum <= chi_inv_value, errors_sum, chi_inv_value, gl
+
+def runs_test(nums):
+    return runs_measure(nums)[0]
+
+def runs_measure(nums):
+    """
+    Corridas ascendentes y descendentes: cuenta los cambios de signo entre diferencias consecutivas.
+    Con numeros independientes hay (2n - 1) / 3 corridas en promedio, con varianza (16n - 29) / 90.
+    """
+    nums = np.asarray(nums, dtype=np.float64)
+    n = len(nums)
+    if n < 2:
+        raise ValueError("Runs test needs at least 2 numbers.")
+    ups = np.diff(nums) > 0
+    runs = 1 + int(np.count_nonzero(ups[1:] != ups[:-1]))
+    mean = (2 * n - 1) / 3
+    deviation = math.sqrt((16 * n - 29) / 90)
+    z = get_quantile("norm", 1 - ACCEPTABLE_ERROR / 2)
+    li, ls = mean - z * deviation, mean + z * deviation
+    return li <= runs <= ls, runs, (li, ls), None
+
+def gap_test(nums):
+    return gap_measure(nums)[0]
+
+def gap_measure(nums, interval=GAP_RANGE, categories=GAP_CATEGORIES):
+    """
+    Huecos: cuenta cuantos numeros fuera de `interval` hay entre dos apariciones seguidas de numeros dentro
+    de el. Un hueco de longitud k tiene probabilidad p (1 - p)^k, con p el ancho del intervalo; los huecos
+    largos se agrupan en una categoria, reducida si hace falta para que se esperen al menos 5 en ella.
+
+    Si hay tan pocos huecos que ni con una sola categoria de largos se esperan 5, el bloque se rechaza:
+    con numeros uniformes en un bloque de la bateria eso no ocurre, y chi cuadrado no se puede aplicar.
+    """
+    nums = np.asarray(nums, dtype=np.float64)
+    low, high = interval
+    p = high - low
+    gaps = np.diff(np.flatnonzero((nums >= low) & (nums < high))) - 1
+    total = len(gaps)
+    fitting = int(math.log(total / GAP_MIN_EXPECTED) / -math.log(1 - p)) if total >= GAP_MIN_EXPECTED else 0
+    categories = min(categories, fitting)
+    if categories < 1:
+        return False, math.inf, get_quantile("chi2", 1 - ACCEPTABLE_ERROR, 1), 1
+    observed = np.bincount(np.minimum(gaps, categories), minlength=categories + 1)
+    probabilities = p * (1 - p) ** np.arange(categories + 1)
+    probabilities[-1] = (1 - p) ** categories
+    expected = probabilities * total
+    chi_2_statistic = float((((observed - expected) ** 2) / expected).sum())
+    gl = categories
+    chi_inv_value = get_quantile("chi2", 1 - ACCEPTABLE_ERROR, gl)
+    return chi_2_statistic <= chi_inv_value, chi_2_statistic, chi_inv_value, gl
+
+def autocorrelation_test(nums):
+    return autocorrelation_measure(nums)[0]
+
+def autocorrelation_measure(nums, lag=AUTOCORRELATION_LAG):
+    """
+    Autocorrelacion con retardo `lag`, usando la media (1/2) y la varianza (1/12) de la uniforme:
+    sin correlacion el estimador tiene media 0 y desviacion 1 / sqrt(n - lag).
+    """
+    centered = np.asarray(nums, dtype=np.float64) - 0.5
+    if not 0 < lag < len(centered):
+        raise ValueError("Lag must be positive and smaller than the amount of numbers.")
+    pairs = len(centered) - lag
+    correlation = 12 * float(np.dot(centered[:-lag], centered[lag:])) / pairs
+    z = get_quantile("norm", 1 - ACCEPTABLE_ERROR / 2)
+    ls = z / math.sqrt(pairs)
+    return -ls <= correlation <= ls, correlation, (-ls, ls), None
+
+def test_p_value(name, statistic, n, gl=None):
+    """
+    P-valor del estadistico de una prueba de test_numbers. Usa scipy, que se importa recien aqui:
+    validar un bloque no necesita p-valores.
+
+    :param name: Nombre de la prueba, de TEST_NAMES o de SEQUENTIAL_TEST_NAMES
+    :param n: Cantidad de numeros probados
+    :param gl: Grados de libertad de las pruebas que los tienen
+    """
+    from scipy.stats import chi2, kstwobign, norm
+    if name == "averages":
+        return float(2 * norm.sf(abs(statistic - 0.5) * math.sqrt(12 * n)))
+    if name == "variance":
+        x = 12 * (n - 1) * statistic
+        return float(min(1.0, 2 * min(chi2.cdf(x, gl), chi2.sf(x, gl))))
+    if name == "runs":
+        return float(2 * norm.sf(abs(statistic - (2 * n - 1) / 3) / math.sqrt((16 * n - 29) / 90)))
+    if name == "autocorrelation":
+        return float(2 * norm.sf(abs(statistic) * math.sqrt(n - AUTOCORRELATION_LAG)))
+    if name == "ks":
+        return float(kstwobign.sf(statistic * math.sqrt(n)))
+    return float(chi2.sf(statistic, gl))
+
+def sturges_intervals(n):
+    return int(1 + 3.322 * math.log(n, math.e))
 
 def generate_intervals(nums):
-    k = int(1 + 3.322 * math.log(len(nums), math.e))
-    lims = np.linspace(min(nums), max(nums), k + 1)
-    intervs = pd.cut(nums, bins=lims, include_lowest=True)
-    table = pd.DataFrame({
-        "Inters": intervs.value_counts().index,
-        "Frecs": intervs.value_counts().values
-    }).reset_index(drop=True)
-    frecs = table["Frecs"].astype(int).to_list()
-    inters = [[float(intervalo.left), float(intervalo.right)] for intervalo in table["Inters"]]
-    return { "Inters": inters, "Frecs": frecs }
\ No newline at end of file
+    """
+    Divide el rango de la muestra en 1 + 3.322 ln(n) intervalos iguales (Sturges) y cuenta los
+    numeros de cada uno, en el orden de los intervalos.
+
+    :return: Diccionario con "Inters" (arreglo de [inicio, fin] por intervalo) y "Frecs" (frecuencias)
+    """
+    nums = np.asarray(nums, dtype=np.float64)
+    k = sturges_intervals(len(nums))
+    frecs, lims = np.histogram(nums, bins=k, range=(float(nums.min()), float(nums.max())))
+    return { "Inters": np.column_stack((lims[:-1], lims[1:])), "Frecs": frecs }
@@ -0,0 +1,81 @@
+import sys
+from unittest.mock import MagicMock
+
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+
+import numpy as np
+import pytest
+from scripts import number_generators
+from scripts.number_generators import BACKENDS, generate_block, get_backend
+
+MASK_64 = 2**64 - 1
+
+def pcg32_reference(state, inc, size):
+    # implementacion escalar de referencia de PCG32 XSH RR
+    numbers = []
+    for i in range(size):
+        xorshifted = (((state >> 18) ^ state) >> 27) & 0xFFFFFFFF
+        rot = state >> 59
+        numbers.append(((xorshifted >> rot) | (xorshifted << ((-rot) & 31))) & 0xFFFFFFFF)
+        state = (state * number_generators.PCG_MULTIPLIER + inc) & MASK_64
+    return numbers
+
+def test_every_backend_generates_a_float_block_in_unit_interval():
+    for name, backend in BACKENDS.items():
+        conf = backend.make_conf(123456, 20)
+        assert conf['backend'] == name
+        numbers = generate_block(conf, 5000)
+        assert numbers.dtype == np.float64
+        assert len(numbers) == 5000
+        assert numbers.min() >= 0 and numbers.max() <= 1
+        assert generate_block(conf, 0).tolist() == []
+
+def test_backend_blocks_are_reproducible_prefixes():
+    for backend in BACKENDS.values():
+        conf = backend.make_conf(99, 16)
+        if backend.name != "xorshift": # xorshift reparte el bloque en carriles, su prefijo depende del tamaño
+            assert generate_block(conf, 3000)[:100].tolist() == generate_block(conf, 100).tolist()
+        assert generate_block(conf, 3000).tolist() == generate_block(conf, 3000).tolist()
+
+def test_lcg_backend_matches_course_generator():
+    conf = {'X0': 9, 'k': 21, 'c': 19, 'g': 16}
+    a, m = 1 + 2*conf['k'], 2**conf['g']
+    X_i, expected = conf['X0'], []
+    for _ in range(2000):
+        X_i = (a * X_i + conf['c']) % m
+        expected.append(X_i / (m - 1))
+    assert generate_block(conf, 2000).tolist() == expected
+    assert generate_block(dict(conf, backend="lcg"), 2000).tolist() == expected
+
+def test_mcg_backend_matches_multiplicative_recurrence():
+    conf = get_backend("mcg").make_conf(777, 16)
+    m = 2**16
+    X_i, expected = conf['X0'], []
+    for _ in range(2000):
+        X_i = (conf['a'] * X_i) % m
+        expected.append(X_i / m)
+    assert generate_block(conf, 2000).tolist() == expected
+
+def test_pcg_backend_matches_scalar_reference():
+    conf = get_backend("pcg").make_conf(42, 20)
+    expected = pcg32_reference(conf['state'], conf['inc'], 3000)
+    assert (generate_block(conf, 3000) * 2.0**32).astype(np.uint64).tolist() == expected
+
+def test_xorshift_backend_lanes_follow_xorshift64():
+    conf = get_backend("xorshift").make_conf(5, 20)
+    lanes = number_generators.XORSHIFT_LANES
+    numbers = generate_block(conf, lanes * 3)
+    x = int(number_generators.splitmix64([5 * lanes])[0])
+    for row in range(3):
+        x ^= (x << 13) & MASK_64
+        x ^= x >> 7
+        x ^= (x << 17) & MASK_64
+        assert numbers[row * lanes] == (x >> 11) * 2.0**-53
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend("mersenne")
+    with pytest.raises(ValueError):
+        generate_block({'seed': 1, 'backend': "mersenne"}, 10)
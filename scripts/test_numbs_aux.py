@@ -0,0 +1,265 @@
+import sys
+from unittest.mock import MagicMock
+
+sys.modules['pygame'] = MagicMock()
+sys.modules['tkinter'] = MagicMock()
+sys.modules['scripts.game_configs'] = MagicMock()
+
+import numpy as np
+import pytest
+from scripts import numbs_aux
+from scripts.numbs_aux import generate_numbers, jump_ahead, lcg_period, stream_numbers
+
+def sequential_numbers(conf):
+    # recurrencia congruencial original, numero a numero
+    a = 1 + 2*conf['k']
+    m = 2**conf['g']
+    numbers = []
+    X_i = conf['X0']
+    for i in range(m//2):
+        X_i = ((a * X_i) + conf['c']) % m
+        numbers.append(X_i / (m - 1))
+    return numbers
+
+def test_generate_numbers_matches_sequential_recurrence():
+    for conf in [
+        {'X0': 5, 'k': 3, 'c': 7, 'g': 4},
+        {'X0': 1, 'k': 99, 'c': 3, 'g': 11},
+        {'X0': 123456, 'k': 123457, 'c': 246913, 'g': 20},
+    ]:
+        numbers = generate_numbers(conf)
+        assert numbers.tolist() == sequential_numbers(conf)
+
+def test_generate_numbers_returns_contiguous_float_array():
+    numbers = generate_numbers({'X0': 17, 'k': 5, 'c': 35, 'g': 12})
+    assert isinstance(numbers, np.ndarray)
+    assert numbers.dtype == np.float64
+    assert numbers.flags['C_CONTIGUOUS']
+    assert len(numbers) == 2**11
+    assert numbers.min() >= 0 and numbers.max() <= 1
+
+def test_jump_ahead_matches_stepping_the_recurrence():
+    conf = {'X0': 1234, 'k': 4321, 'c': 2469, 'g': 16}
+    a, m = 1 + 2*conf['k'], 2**conf['g']
+    X_i = conf['X0']
+    for steps in range(1, 300):
+        X_i = (a * X_i + conf['c']) % m
+        assert jump_ahead(conf, steps)['X0'] == X_i
+    assert jump_ahead(conf, 0) == conf
+
+def test_generate_numbers_with_offset_continues_the_sequence():
+    conf = {'X0': 77, 'k': 1001, 'c': 155, 'g': 14}
+    numbers = generate_numbers(conf)
+    for offset in [1, 1000, 5000]:
+        assert generate_numbers(conf, offset=offset).tolist() == numbers[offset:].tolist()
+
+def test_generate_numbers_with_size_returns_a_prefix():
+    conf = {'X0': 9, 'k': 21, 'c': 19, 'g': 16}
+    numbers = generate_numbers(conf)
+    assert generate_numbers(conf, size=3000).tolist() == numbers[:3000].tolist()
+    assert generate_numbers(conf, offset=10, size=5).tolist() == numbers[10:15].tolist()
+
+def test_generate_numbers_empty_and_invalid_ranges():
+    conf = {'X0': 1, 'k': 1, 'c': 1, 'g': 4}
+    assert generate_numbers(conf, offset=8).tolist() == []
+    assert generate_numbers(conf, size=0).dtype == np.float64
+    with pytest.raises(ValueError):
+        generate_numbers(conf, offset=-1)
+    with pytest.raises(ValueError):
+        generate_numbers(conf, size=-1)
+    with pytest.raises(ValueError):
+        generate_numbers(conf, offset=9)
+
+def test_lcg_period_matches_stepping_the_recurrence():
+    for conf in [{'X0': 3, 'k': 2, 'c': 5, 'g': 8}, {'X0': 3, 'k': 1, 'c': 5, 'g': 8}, {'X0': 4, 'k': 3, 'c': 2, 'g': 8}]:
+        a, m = 1 + 2*conf['k'], 2**conf['g']
+        X_i, steps = conf['X0'], 0
+        while True:
+            X_i = (a * X_i + conf['c']) % m
+            steps += 1
+            if X_i == conf['X0']:
+                break
+        assert lcg_period(conf) == steps
+
+def test_stream_numbers_continues_the_sequence_across_chunks():
+    conf = {'X0': 77, 'k': 1000, 'c': 155, 'g': 14}
+    chunks = list(stream_numbers(conf, chunk_size=1000, offset=5, limit=4500))
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 1000, 1000, 500]
+    assert np.concatenate(chunks).tolist() == generate_numbers(conf, offset=5, size=4500).tolist()
+
+def test_stream_numbers_stops_at_the_period():
+    conf = {'X0': 3, 'k': 1, 'c': 5, 'g': 8} # a = 3, periodo menor que m
+    numbers = np.concatenate(list(stream_numbers(conf, chunk_size=7)))
+    assert len(numbers) == lcg_period(conf) < 2**8
+    assert len(set(numbers.tolist())) == len(numbers)
+
+def test_stream_numbers_with_large_g():
+    conf = {'X0': 2**61 + 12345, 'k': 2**40 + 6, 'c': 2**63 + 1, 'g': 64}
+    a, m = 1 + 2*conf['k'], 2**64
+    chunk = next(stream_numbers(conf, chunk_size=2000))
+    X_i, expected = conf['X0'], []
+    for _ in range(2000):
+        X_i = (a * X_i + conf['c']) % m
+        expected.append(np.float64(X_i) / float(m - 1))
+    assert chunk.tolist() == expected
+    assert lcg_period(conf) == m
+    with pytest.raises(ValueError):
+        next(stream_numbers(dict(conf, g=65)))
+
+def test_sample_moments_match_the_list_formulas():
+    nums = generate_numbers({'X0': 123456, 'k': 123457, 'c': 246913, 'g': 20}, size=50000)
+    as_list = nums.tolist()
+    mean = sum(as_list) / len(as_list)
+    variance = sum((x - mean) ** 2 for x in as_list) / len(as_list)
+    n, sample_mean, sample_variance = numbs_aux.sample_moments(nums)
+    assert n == 50000
+    assert sample_mean == pytest.approx(mean, rel=1e-12)
+    assert sample_variance == pytest.approx(variance, rel=1e-9)
+    assert numbs_aux.sample_moments(as_list) == numbs_aux.sample_moments(nums)
+
+def test_moment_tests_accept_arrays_and_lists():
+    nums = generate_numbers({'X0': 123456, 'k': 123457, 'c': 246913, 'g': 20}, size=50000)
+    assert numbs_aux.averages_test(nums) == numbs_aux.averages_test(nums.tolist())
+    assert numbs_aux.variance_test(nums) == numbs_aux.variance_test(nums.tolist())
+    assert not numbs_aux.averages_test(np.full(1000, 0.7))
+    assert not numbs_aux.variance_test(np.full(1000, 0.5))
+
+def string_poker_hands(nums):
+    # clasificacion original, numero a numero con cadenas
+    categories = {"TD": 0, "1P": 0, "2P": 0, "1T": 0, "F": 0, "P": 0, "Q": 0}
+    hands = {(1, 1, 1, 1, 1): "TD", (2, 1, 1, 1): "1P", (2, 2, 1): "2P", (3, 1, 1): "1T", (3, 2): "F", (4, 1): "P", (5,): "Q"}
+    for num in nums:
+        digits = f'{int(num * 100000):05}'
+        count_values = tuple(sorted((digits.count(digit) for digit in set(digits)), reverse=True))
+        if count_values in hands:
+            categories[hands[count_values]] += 1
+    return categories
+
+def test_poker_hands_match_string_classification():
+    nums = generate_numbers({'X0': 123456, 'k': 123457, 'c': 246913, 'g': 20}, size=100000)
+    special = [0.0, 0.99999, 1.0, 0.11111, 0.12121, 0.11122, 0.00001]
+    for sample in (nums, special):
+        assert numbs_aux.poker_hands(sample) == string_poker_hands(sample)
+    assert numbs_aux.poker_hands([]) == {"TD": 0, "1P": 0, "2P": 0, "1T": 0, "F": 0, "P": 0, "Q": 0}
+
+def test_generate_intervals_counts_every_number_in_interval_order():
+    nums = generate_numbers({'X0': 123456, 'k': 123457, 'c': 246913, 'g': 20}, size=10000)
+    data = numbs_aux.generate_intervals(nums)
+    k = int(1 + 3.322 * np.log(10000))
+    assert data["Inters"].shape == (k, 2)
+    assert data["Inters"][0][0] == nums.min() and data["Inters"][-1][1] == nums.max()
+    assert (data["Inters"][1:, 0] == data["Inters"][:-1, 1]).all()
+    assert data["Frecs"].sum() == 10000
+    for (left, right), frec in zip(data["Inters"][1:-1], data["Frecs"][1:-1]):
+        assert frec == ((nums >= left) & (nums < right)).sum()
+
+def test_interval_tests_reuse_a_given_histogram():
+    nums = generate_numbers({'X0': 123456, 'k': 123457, 'c': 246913, 'g': 20}, size=10000)
+    data = numbs_aux.generate_intervals(nums)
+    assert numbs_aux.chi_2_test(nums, data) == numbs_aux.chi_2_test(nums)
+    assert numbs_aux.ks_test(nums, data) == numbs_aux.ks_test(nums)
+    # un histograma con todos los numeros en un intervalo rechaza ambas pruebas
+    skewed = {"Inters": data["Inters"], "Frecs": np.eye(len(data["Frecs"]), dtype=int)[0] * 10000}
+    assert not numbs_aux.chi_2_test(nums, skewed)
+    assert not numbs_aux.ks_test(nums, skewed)
+
+def test_get_ks_value_reads_indexed_table():
+    assert numbs_aux.get_ks_value(1) == 0.975
+    assert numbs_aux.get_ks_value(50) == 0.18841
+    assert numbs_aux.get_ks_value(0) is None
+    assert numbs_aux.get_ks_value(51) is None
+
+def test_ks_statistic_uses_cumulative_frequencies_in_interval_order():
+    # 4 intervalos: acumuladas observadas 0.1, 0.5, 0.8, 1.0 contra 0.25, 0.5, 0.75, 1.0, D = 0.15
+    nums = np.zeros(100)
+    data = {"Inters": np.zeros((4, 2)), "Frecs": np.array([10, 40, 30, 20])}
+    assert not numbs_aux.ks_test(nums, data) # critico 1.36 / 10 = 0.136
+    data["Frecs"] = np.array([20, 30, 25, 25])
+    assert numbs_aux.ks_test(nums, data) # D = 0.05
+
+def test_quantile_table_matches_scipy():
+    from scipy.stats import chi2, norm
+    assert numbs_aux.get_quantile("norm", 1 - 0.05 / 2) == pytest.approx(norm.ppf(0.975), rel=1e-12)
+    assert numbs_aux.get_quantile("chi2", 1 - 0.05, 6) == pytest.approx(chi2.ppf(0.95, 6), rel=1e-12)
+    # 1 - (1 - 0.025) no es exactamente 0.025 y debe encontrar la misma entrada
+    assert ("chi2", 0.025, 2**16 - 1) in numbs_aux.quantile_values
+    assert numbs_aux.get_quantile("chi2", 1 - (1 - 0.025), 2**16 - 1) == pytest.approx(chi2.ppf(0.025, 2**16 - 1), rel=1e-12)
+
+def test_quantile_outside_the_table_falls_back_to_scipy():
+    from scipy.stats import chi2
+    assert ("chi2", 0.975, 12344) not in numbs_aux.quantile_values
+    assert numbs_aux.get_quantile("chi2", 0.975, 12344) == pytest.approx(chi2.ppf(0.975, 12344), rel=1e-12)
+    assert ("chi2", 0.975, 12344) in numbs_aux.quantile_values
+
+def test_subsample_plan_follows_dkw_bound():
+    plan = numbs_aux.subsample_plan(2**22, confidence=0.95, tolerance=0.02)
+    assert plan["strata"] >= np.log(2 / 0.05) / (2 * 0.02 ** 2)
+    assert plan["sample_size"] == plan["strata"] + plan["windows"] * plan["window_size"]
+    assert plan["sample_size"] & (plan["sample_size"] - 1) == 0 # potencia de 2
+    assert (plan["confidence"], plan["tolerance"]) == (0.95, 0.02)
+    # el tamaño no crece con el bloque
+    assert numbs_aux.subsample_plan(2**30, 0.95, 0.02) == plan
+    # un bloque chico se prueba entero, sin margen de error
+    assert numbs_aux.subsample_plan(4096) == {"strata": 4096, "windows": 0, "window_size": 0, "sample_size": 4096,
+                                             "confidence": 1.0, "tolerance": 0.0}
+    with pytest.raises(ValueError):
+        numbs_aux.subsample_plan(4096, confidence=1)
+
+def test_stratified_subsample_takes_one_number_per_stratum_and_windows():
+    numbers = np.arange(2**18) / 2**18
+    plan = numbs_aux.subsample_plan(len(numbers), confidence=0.95, tolerance=0.02)
+    sample = numbs_aux.stratified_subsample(numbers, plan, seed=7)
+    assert len(sample) == plan["sample_size"]
+    strata = sample[:plan["strata"]] * 2**18
+    bounds = np.linspace(0, 2**18, plan["strata"] + 1).astype(int)
+    assert ((strata >= bounds[:-1]) & (strata < bounds[1:])).all()
+    for i in range(plan["windows"]):
+        window = sample[plan["strata"] + i * plan["window_size"]:plan["strata"] + (i + 1) * plan["window_size"]]
+        assert (np.diff(window) == 1 / 2**18).all()
+    assert numbs_aux.stratified_subsample(numbers, plan, seed=7).tolist() == sample.tolist()
+    assert numbs_aux.stratified_subsample(numbers[:100], plan).tolist() == numbers[:100].tolist()
+
+def test_subsample_results_state_the_assurance():
+    numbers = numbs_aux.stream_numbers({'X0': 123456, 'k': 123456, 'c': 246913, 'g': 40}, chunk_size=2**18, limit=2**18)
+    results, plan = numbs_aux.test_subsample_results(next(numbers), seed=1)
+    assert set(results) <= set(numbs_aux.TEST_NAMES)
+    assert plan["confidence"] == numbs_aux.SUBSAMPLE_CONFIDENCE
+    assert plan["sample_size"] < 2**18
+
+def test_sequential_tests_accept_independent_numbers():
+    numbers = np.random.default_rng(5).random(2**14)
+    for name in numbs_aux.SEQUENTIAL_TEST_NAMES:
+        passed, statistic, _, gl = numbs_aux.battery_tests(numbers)[name]()
+        assert passed
+        assert 0.01 < numbs_aux.test_p_value(name, statistic, len(numbers), gl) <= 1
+
+def test_sequential_tests_reject_an_ordered_sequence():
+    # un LCG con multiplicador a = 1 + 2k chico pasa las pruebas de distribucion pero no las de orden
+    numbers = numbs_aux.generate_numbers({'X0': 1, 'k': 1, 'c': 1, 'g': 20}, size=2**16)
+    assert numbs_aux.test_numbers(numbers)
+    assert not numbs_aux.runs_test(numbers)
+    assert not numbs_aux.gap_test(numbers)
+    assert not numbs_aux.autocorrelation_test(numbers)
+
+def test_runs_and_gap_counts():
+    # corridas: sube, sube, baja, sube -> 3 corridas
+    assert numbs_aux.runs_measure([0.1, 0.2, 0.3, 0.1, 0.5])[1] == 3
+    numbers = np.array([0.1, 0.9, 0.9, 0.2, 0.3, 0.8, 0.4] * 100)
+    _, _, _, gl = numbs_aux.gap_measure(numbers)
+    gaps = np.diff(np.flatnonzero(numbers < 0.5)) - 1
+    assert gl == min(numbs_aux.GAP_CATEGORIES, int(np.log(len(gaps) / 5) / np.log(2)))
+
+def test_gap_test_rejects_blocks_with_too_few_gaps():
+    passed, statistic, _, gl = numbs_aux.gap_measure(np.linspace(0.6, 0.99, 4096))
+    assert not passed
+    assert statistic == np.inf and gl == 1
+    assert not numbs_aux.gap_test([0.1, 0.7, 0.2, 0.8, 0.9, 0.3])
+
+def test_runs_and_autocorrelation_need_enough_numbers():
+    with pytest.raises(ValueError):
+        numbs_aux.runs_measure([0.5])
+    assert numbs_aux.runs_measure([0.1, 0.2])[1] == 1
+    with pytest.raises(ValueError):
+        numbs_aux.autocorrelation_measure([0.1, 0.2], lag=2)
+    with pytest.raises(ValueError):
+        numbs_aux.autocorrelation_measure([0.1, 0.2], lag=0)